@@ -1,28 +1,116 @@
-from fastapi import FastAPI, Query, HTTPException
-from typing import Optional
+import asyncio
+import httpx
+import logging
+import orjson
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Query, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
 from vendor_finder import VendorFinder
+from search_cache import SearchCache
 from config import Config
 
-app = FastAPI(
-    title="Local Vendor Finder API",
-    description="AI-powered vendor discovery for any service and location",
-    version="1.0.0"
-)
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------------------------
+# RESPONSE MODELS (serialized by pydantic-core, not jsonable_encoder)
+# ----------------------------------------------------------------------
+
+class IdentityOut(BaseModel):
+    name: str
+    source: str
+    url: str
+
+
+class ContactsOut(BaseModel):
+    whatsapp: List[str]
+
+
+class SocialOut(BaseModel):
+    instagram: List[str]
+
+
+class GoogleMapsOut(BaseModel):
+    address: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    rating: Optional[float] = None
+    place_id: Optional[str] = None
+    source: Optional[str] = None
+
+
+class LocationOut(BaseModel):
+    text: Optional[str] = None
+    resolved: Optional[str] = None
+    google_maps: Optional[GoogleMapsOut] = None
+
 
-finder = VendorFinder()
+class VendorOut(BaseModel):
+    identity: IdentityOut
+    contacts: ContactsOut
+    social: SocialOut
+    location: LocationOut
+    confidence_score: float
+    evidence: List[str]
+
+
+class QueryOut(BaseModel):
+    service: str
+    location: str
+    platform: str
+
+
+class SearchResponse(BaseModel):
+    query: QueryOut
+    total_vendors: int
+    vendors: List[VendorOut]
+    analysis: Optional[Dict[str, Any]] = None
+    agent_reasoning: Optional[List[Any]] = None
 
 
-@app.on_event("startup")
 def startup_check():
     """
     Warn if API keys are missing (non-blocking).
     """
     missing_keys = Config.validate_config()
     if missing_keys:
-        print("⚠️ Missing API keys:")
-        for key in missing_keys:
-            print(f"   - {key}")
-        print("API will run with limited functionality.\n")
+        logger.warning(
+            "⚠️ Missing API keys: %s. API will run with limited functionality.",
+            ", ".join(missing_keys)
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build shared resources once per worker and release them on shutdown.
+    """
+    startup_check()
+
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=10,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+    app.state.cache = SearchCache(namespace="api")
+    app.state.finder = VendorFinder()
+
+    yield
+
+    await asyncio.to_thread(app.state.finder.close)
+    await app.state.http.aclose()
+    await app.state.cache.close()
+
+
+app = FastAPI(
+    title="Local Vendor Finder API",
+    description="AI-powered vendor discovery for any service and location",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 
 @app.get("/health")
@@ -30,8 +118,9 @@ def health_check():
     return {"status": "ok"}
 
 
-@app.get("/search")
-def search_vendors(
+@app.get("/search", response_model=SearchResponse, response_model_exclude_none=True)
+async def search_vendors(
+    request: Request,
     service: str = Query(..., description="Service or product (e.g. plumber, cake, photographer)"),
     location: str = Query(..., description="City or area (e.g. Abuja, Lagos, Ibadan)"),
     platform: Optional[str] = Query(
@@ -46,16 +135,24 @@ def search_vendors(
     No service or location is hardcoded.
     """
 
+    state = request.app.state
+
+    key = state.cache.key(service, location, platform or "auto", max_results, min_confidence)
+    cached = await state.cache.get(key)
+    if cached is not None:
+        return cached
+
     try:
-        result = finder.find_vendors(
+        result = await state.finder.find_vendors_async(
             service=service,
             location=location,
+            client=state.http,
             platform=platform or "instagram",
             max_results=max_results,
             min_confidence=min_confidence
         )
 
-        return {
+        response = {
             "query": {
                 "service": service,
                 "location": location,
@@ -69,3 +166,48 @@ def search_vendors(
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    # Empty results are often transient (quota / network), so don't pin them
+    if response["vendors"]:
+        await state.cache.set(key, response)
+
+    return response
+
+
+
+@app.get("/search/stream")
+async def stream_vendors(
+    request: Request,
+    service: str = Query(..., description="Service or product (e.g. plumber, cake, photographer)"),
+    location: str = Query(..., description="City or area (e.g. Abuja, Lagos, Ibadan)"),
+    platform: Optional[str] = Query(
+        None,
+        description="Preferred platform (instagram, twitter). Visual services auto-force instagram."
+    ),
+    max_results: int = Query(5, ge=1, le=20),
+    min_confidence: float = Query(0.3, ge=0.1, le=1.5)
+):
+    """
+    Same search as /search, streamed as NDJSON.
+
+    Emits one {"type": "candidate", "vendor": ...} line per vendor as soon as
+    it is extracted, then a final {"type": "result", ...} line with the
+    ranked vendors, analysis and agent reasoning, or {"type": "error",
+    "detail": ...} where /search would answer 500.
+    """
+
+    finder = request.app.state.finder
+    client = request.app.state.http
+
+    async def events():
+        async for event in finder.iter_vendors(
+            service=service,
+            location=location,
+            client=client,
+            platform=platform or "instagram",
+            max_results=max_results,
+            min_confidence=min_confidence
+        ):
+            yield orjson.dumps(event) + b"\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
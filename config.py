@@ -1,4 +1,5 @@
 """Configuration module for loading environment variables."""
+import functools
 import os
 from dotenv import load_dotenv
 
@@ -6,6 +7,24 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+# Placeholder values shipped in the sample .env
+_PLACEHOLDERS = frozenset({
+    "",
+    "your_google_api_key_here",
+    "your_search_engine_id_here",
+    "your_bing_api_key_here",
+    "your_google_maps_api_key_here",
+})
+
+# NOTE: OPENAI_API_KEY intentionally NOT required
+_REQUIRED_KEYS = (
+    "GOOGLE_API_KEY",
+    "GOOGLE_SEARCH_ENGINE_ID",
+    "BING_API_KEY",
+    "GOOGLE_MAPS_API_KEY",
+)
+
+
 class Config:
     """Configuration class for API keys and settings."""
 
@@ -26,28 +45,70 @@ class Config:
     # OpenAI API (LLM reasoning layer)
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 
+    # Validate + re-rank + analyze + decide in a single LLM call per attempt
+    LLM_BATCH_REASONING = os.getenv('LLM_BATCH_REASONING', 'true').lower() == 'true'
+
+    # FlashRank cross-encoder for vendor intent when flashrank is installed
+    # (empty disables); scores in [LOW, HIGH) are still checked by the LLM
+    CROSS_ENCODER_MODEL = os.getenv('CROSS_ENCODER_MODEL', 'ms-marco-TinyBERT-L-2-v2')
+    VENDOR_INTENT_LOW = float(os.getenv('VENDOR_INTENT_LOW', '0.4'))
+    VENDOR_INTENT_HIGH = float(os.getenv('VENDOR_INTENT_HIGH', '0.6'))
+
+    # Order cross-encoder-validated vendors with an LLM call instead of by score
+    LLM_RERANK = os.getenv('LLM_RERANK', 'false').lower() == 'true'
+
+    # Vendors at or above this confidence with WhatsApp count as strong; a
+    # full page of them skips LLM analysis (non-batched reasoning only)
+    STRONG_VENDOR_CONFIDENCE = float(os.getenv('STRONG_VENDOR_CONFIDENCE', '0.7'))
+
+    # In-process cache of LLM completions keyed by prompt (seconds)
+    LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', '3600'))
+
     # Rate limiting
     MAX_REQUESTS_PER_MINUTE = int(os.getenv('MAX_REQUESTS_PER_MINUTE', '60'))
 
-    @staticmethod
-    def validate_config():
-        """Validate that required (non-optional) API keys are set."""
-        missing_keys = []
+    # Redis response cache for /search (disabled when REDIS_URL is unset)
+    REDIS_URL = os.getenv('REDIS_URL', '')
+    SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', '21600'))
+
+    # In-process VendorFinder result cache TTL (seconds)
+    FINDER_CACHE_TTL = int(os.getenv('FINDER_CACHE_TTL', '1800'))
+
+    # In-process per-query search API result cache TTL (seconds)
+    ENGINE_CACHE_TTL = int(os.getenv('ENGINE_CACHE_TTL', '600'))
 
-        if not Config.GOOGLE_API_KEY or Config.GOOGLE_API_KEY == 'your_google_api_key_here':
-            missing_keys.append('GOOGLE_API_KEY')
+    # In-process Google Maps place / reverse-geocode cache TTL (seconds)
+    MAPS_CACHE_TTL = int(os.getenv('MAPS_CACHE_TTL', '86400'))
 
-        if not Config.GOOGLE_SEARCH_ENGINE_ID or Config.GOOGLE_SEARCH_ENGINE_ID == 'your_search_engine_id_here':
-            missing_keys.append('GOOGLE_SEARCH_ENGINE_ID')
+    # Concurrent Google Maps lookups per extractor (keeps under Places QPS limits)
+    MAPS_CONCURRENCY = int(os.getenv('MAPS_CONCURRENCY', '10'))
 
-        if not Config.BING_API_KEY or Config.BING_API_KEY == 'your_bing_api_key_here':
-            missing_keys.append('BING_API_KEY')
+    # Skip Maps enrichment below this preliminary confidence (0 = always enrich)
+    MAPS_MIN_PRELIM_SCORE = float(os.getenv('MAPS_MIN_PRELIM_SCORE', '0.5'))
 
-        if not Config.GOOGLE_MAPS_API_KEY or Config.GOOGLE_MAPS_API_KEY == 'your_google_maps_api_key_here':
-            missing_keys.append('GOOGLE_MAPS_API_KEY')
+    # Results search_vendors returns by default (0 = all, fully sorted)
+    SEARCH_TOP_K = int(os.getenv('SEARCH_TOP_K', '20'))
 
-        # NOTE: OPENAI_API_KEY intentionally NOT required
-        return missing_keys
+    # Stop issuing search calls once top-k results all score at least this,
+    # not counting the platform bonus, and every configured engine has
+    # answered (0 disables the early exit)
+    SEARCH_SATURATION_SCORE = float(os.getenv('SEARCH_SATURATION_SCORE', '0.8'))
+
+    # Comma-separated origins allowed to call the web API
+    CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*')
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def validate_config():
+        """
+        Validate that required (non-optional) API keys are set.
+
+        Keys are read once at import, so the result is cached.
+        """
+        return tuple(
+            key for key in _REQUIRED_KEYS
+            if getattr(Config, key) in _PLACEHOLDERS
+        )
 
 
 
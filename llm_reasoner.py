@@ -7,6 +7,11 @@ Responsibilities:
 - Re-rank vendors using judgment
 """
 
+import httpx
+import orjson
+import threading
+from string import Template
+from cachetools import TTLCache
 from typing import List, Dict, Optional
 
 try:
@@ -20,10 +25,141 @@ from config import Config
 class LLMReasoner:
     """Reasoning and judgment layer for vendor discovery."""
 
-    def __init__(self):
+    MODEL = "gpt-4.1-mini"
+
+    # Confidence spread above which LLM re-ranking can't beat the ordering
+    RERANK_CONFIDENCE_GAP = 0.4
+
+    # ==============================================================
+    # PROMPT TEMPLATES
+    # ==============================================================
+
+    RERANK_PROMPT = Template("""
+You are helping rank vendors for the service "$service".
+
+Here are vendor candidates (JSON):
+$vendors
+
+Instructions:
+- Reorder vendors by overall usefulness to the user.
+- Prefer vendors that appear professional, reachable, and relevant.
+- Do NOT invent data.
+- Return ONLY JSON.
+
+Required JSON format:
+{
+  "ordered_vendor_ids": [list of vendor ids in best-to-worst order],
+  "reasoning": "brief explanation"
+}
+""")
+
+    VALIDATE_PROMPT = Template("""
+You are screening and ranking candidates for the service "$service".
+
+Vendor candidates (JSON):
+$vendors
+
+Instructions:
+- For EACH candidate, decide whether it is a REAL SERVICE VENDOR
+  (offering services) or just content, news, or discussion.
+- Score each candidate's overall usefulness to the user from 0 to 1.
+  Prefer vendors that appear professional, reachable, and relevant.
+- Do NOT invent data.
+- Return ONLY JSON.
+
+Required JSON format:
+{
+  "vendors": [{"id": 0, "is_vendor": true, "rank_score": 0.9}, ...],
+  "reasoning": "brief explanation"
+}
+""")
+
+    REASON_ALL_PROMPT = Template("""
+User searched for "$service" vendors in "$location" on "$platform".
+
+Vendor candidates (JSON):
+$vendors
+
+Tasks:
+1. For EACH candidate, decide whether it is a REAL SERVICE VENDOR
+   (offering services) or just content, news, or discussion.
+2. Reorder the real vendors by overall usefulness to the user.
+   Prefer vendors that appear professional, reachable, and relevant.
+3. Explain briefly how vendors were selected, rate result quality
+   (good / average / weak), and ask ONE clarifying question if needed,
+   otherwise say "NO_QUESTION".
+4. Decide ONE next action: STOP, EXPAND_LOCATION, TRY_ANOTHER_PLATFORM,
+   RELAX_CONFIDENCE. Choose STOP if results are acceptable.
+
+Rules:
+- Do NOT invent data.
+
+Respond ONLY in JSON:
+{
+  "vendor_is_vendor": [true | false for each candidate, in id order],
+  "ordered_vendor_ids": [ids of real vendors in best-to-worst order],
+  "reasoning": "brief explanation of the ordering",
+  "analysis": {
+    "explanation": "...",
+    "result_quality": "good | average | weak",
+    "clarifying_question": "..."
+  },
+  "action": "<ACTION_NAME>"
+}
+""")
+
+    ANALYSIS_PROMPT = Template("""
+User searched for "$service" vendors in "$location".
+
+Top candidates (JSON):
+$vendors
+
+Tasks:
+1. Explain briefly how vendors were selected.
+2. Rate result quality: good / average / weak.
+3. Ask ONE clarifying question if needed, otherwise say "NO_QUESTION".
+
+Respond ONLY in JSON with keys:
+- explanation
+- result_quality
+- clarifying_question
+""")
+
+    NEXT_SEARCH_PROMPT = Template("""
+    User searched for "$service" vendors in "$location" on "$platform".
+
+    Current results (JSON):
+    $vendors
+
+    Decide ONE action:
+    - STOP
+    - EXPAND_LOCATION
+    - TRY_ANOTHER_PLATFORM
+    - RELAX_CONFIDENCE
+
+    Rules:
+    - Choose STOP if results are acceptable.
+    - Choose ONLY ONE action.
+    - Do NOT invent data.
+
+    Respond ONLY in JSON:
+    { "action": "<ACTION_NAME>" }
+    """)
+
+    def __init__(self, http: Optional[httpx.Client] = None):
         self.client = None
         if OpenAI and Config.OPENAI_API_KEY:
-            self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+            # http: shared pooled client; None lets the SDK create its own
+            self.client = OpenAI(api_key=Config.OPENAI_API_KEY, http_client=http)
+
+        # Identical for every call, so build it once
+        self._system_message = {"role": "system", "content": self._system_prompt()}
+
+        # Prompts are built deterministically from their inputs, so a repeated
+        # prompt (same vendors on a retry attempt or a repeat query) is
+        # answered from here instead of another round-trip
+        self._completion_cache = TTLCache(maxsize=512, ttl=Config.LLM_CACHE_TTL)
+        self._completion_cache_lock = threading.Lock()
 
     # ==============================================================
     # STEP 1 — ANALYSIS & EXPLANATION
@@ -41,15 +177,7 @@ class LLMReasoner:
         prompt = self._build_analysis_prompt(service, location, vendors)
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                temperature=0.2,
-                messages=[
-                    {"role": "system", "content": self._system_prompt()},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            return self._safe_json(response.choices[0].message.content)
+            return self._safe_json(self._complete(prompt, temperature=0.2))
 
         except Exception as e:
             return self._fallback_analysis(service, location, vendors, error=str(e))
@@ -80,9 +208,21 @@ class LLMReasoner:
                 "reasoning": "Deterministic ranking retained."
             }
 
-        vendor_snapshot = []
-        for idx, v in enumerate(vendors[:max_vendors]):
-            vendor_snapshot.append({
+        # Skip the LLM when confidence alone already separates the shortlist
+        order = sorted(
+            range(len(vendors)),
+            key=lambda i: vendors[i]["confidence_score"],
+            reverse=True
+        )
+        top = [vendors[i]["confidence_score"] for i in order[:max_vendors]]
+        if top[0] - top[-1] > self.RERANK_CONFIDENCE_GAP:
+            return {
+                "ordered_vendor_ids": order,
+                "reasoning": "Deterministic: clear confidence gap."
+            }
+
+        vendor_snapshot = [
+            {
                 "id": idx,
                 "name": v["identity"]["name"],
                 "confidence": v["confidence_score"],
@@ -90,37 +230,17 @@ class LLMReasoner:
                 "has_instagram": bool(v["social"]["instagram"]),
                 "location": v["location"].get("resolved"),
                 "has_maps": bool(v["location"].get("google_maps"))
-            })
-
-        prompt = f"""
-You are helping rank vendors for the service "{service}".
-
-Here are vendor candidates (JSON):
-{vendor_snapshot}
-
-Instructions:
-- Reorder vendors by overall usefulness to the user.
-- Prefer vendors that appear professional, reachable, and relevant.
-- Do NOT invent data.
-- Return ONLY JSON.
+            }
+            for idx, v in enumerate(vendors[:max_vendors])
+        ]
 
-Required JSON format:
-{{
-  "ordered_vendor_ids": [list of vendor ids in best-to-worst order],
-  "reasoning": "brief explanation"
-}}
-"""
+        prompt = self.RERANK_PROMPT.substitute(
+            service=service,
+            vendors=self._to_json(vendor_snapshot)
+        )
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                temperature=0.1,
-                messages=[
-                    {"role": "system", "content": self._system_prompt()},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            return self._safe_json(response.choices[0].message.content)
+            return self._safe_json(self._complete(prompt, temperature=0.1))
 
         except Exception as e:
             return {
@@ -128,6 +248,184 @@ Required JSON format:
                 "reasoning": f"LLM re-ranking failed: {e}"
             }
 
+    def validate_and_rank_batch(self, service: str, vendors: List[Dict]) -> Dict:
+        """
+        Validate and re-rank vendors in ONE LLM call (replaces a
+        per-vendor intent call plus rerank_vendors).
+
+        Returns:
+        {
+            "vendor_ids": [2, 0],   # actual vendors, best-to-worst
+            "reasoning": "..."
+        }
+        """
+
+        fallback = {
+            "vendor_ids": list(range(len(vendors))),
+            "reasoning": "Deterministic ranking retained."
+        }
+        if not self.client or not vendors:
+            return fallback
+
+        vendor_snapshot = [
+            {
+                "id": idx,
+                "name": v["identity"]["name"],
+                "url": v["identity"]["url"],
+                "confidence": v["confidence_score"],
+                "has_whatsapp": bool(v["contacts"]["whatsapp"]),
+                "has_instagram": bool(v["social"]["instagram"]),
+                "location": v["location"].get("resolved"),
+                "has_maps": bool(v["location"].get("google_maps"))
+            }
+            for idx, v in enumerate(vendors)
+        ]
+
+        prompt = self.VALIDATE_PROMPT.substitute(
+            service=service,
+            vendors=self._to_json(vendor_snapshot)
+        )
+
+        try:
+            data = orjson.loads(self._complete(prompt, temperature=0.1))
+            entries = data.get("vendors") or []
+        except Exception as e:
+            return {**fallback, "reasoning": f"LLM validation failed: {e}"}
+
+        # Missing verdicts default to "is a vendor" (fail open);
+        # unscored vendors keep their deterministic order after scored ones
+        verdicts = {
+            e["id"]: e for e in entries
+            if isinstance(e, dict) and isinstance(e.get("id"), int)
+        }
+        keep = [i for i in range(len(vendors)) if verdicts.get(i, {}).get("is_vendor") is not False]
+
+        def rank_key(i: int):
+            score = verdicts.get(i, {}).get("rank_score")
+            return -score if isinstance(score, (int, float)) else float("inf")
+
+        return {
+            "vendor_ids": sorted(keep, key=rank_key),
+            "reasoning": data.get("reasoning")
+        }
+
+    # ==============================================================
+    # BATCHED REASONING (ONE ROUND-TRIP)
+    # ==============================================================
+
+    NEXT_ACTIONS = ("STOP", "EXPAND_LOCATION", "TRY_ANOTHER_PLATFORM", "RELAX_CONFIDENCE")
+
+    def reason_all(
+        self,
+        service: str,
+        location: str,
+        platform: str,
+        vendors: List[Dict]
+    ) -> Dict:
+        """
+        Validate, re-rank, analyze and decide the next action in ONE LLM call.
+
+        Replaces per-vendor validation, rerank_vendors,
+        analyze_results and decide_next_search.
+
+        Returns:
+        {
+            "vendor_ids": [2, 0],        # actual vendors, best-to-worst
+            "reasoning": "...",
+            "analysis": {...},
+            "action": "STOP"
+        }
+        """
+
+        if not self.client or not vendors:
+            return self._fallback_reasoning(service, location, vendors)
+
+        vendor_snapshot = [
+            {
+                "id": idx,
+                "name": v["identity"]["name"],
+                "url": v["identity"]["url"],
+                "confidence": v["confidence_score"],
+                "has_whatsapp": bool(v["contacts"]["whatsapp"]),
+                "has_instagram": bool(v["social"]["instagram"]),
+                "location": v["location"].get("resolved"),
+                "has_maps": bool(v["location"].get("google_maps"))
+            }
+            for idx, v in enumerate(vendors)
+        ]
+
+        prompt = self.REASON_ALL_PROMPT.substitute(
+            service=service,
+            location=location,
+            platform=platform,
+            vendors=self._to_json(vendor_snapshot)
+        )
+
+        try:
+            data = orjson.loads(self._complete(prompt, temperature=0.1))
+
+        except Exception as e:
+            return self._fallback_reasoning(service, location, vendors, error=str(e))
+
+        return self._normalize_reasoning(data, service, location, vendors)
+
+    def _normalize_reasoning(
+        self,
+        data: Dict,
+        service: str,
+        location: str,
+        vendors: List[Dict]
+    ) -> Dict:
+        """Coerce a reason_all response into valid ids / action / analysis."""
+
+        verdicts = data.get("vendor_is_vendor")
+        if not isinstance(verdicts, list):
+            verdicts = []
+
+        # Missing verdicts default to "is a vendor" (fail open)
+        keep = [
+            i for i in range(len(vendors))
+            if i >= len(verdicts) or verdicts[i] is not False
+        ]
+
+        vendor_ids = []
+        for i in data.get("ordered_vendor_ids") or []:
+            if isinstance(i, int) and i in keep and i not in vendor_ids:
+                vendor_ids.append(i)
+        vendor_ids += [i for i in keep if i not in vendor_ids]
+
+        action = data.get("action")
+        # Hard guardrail (mirrors decide_next_search): decent results stop
+        if action not in self.NEXT_ACTIONS or len(vendor_ids) >= 3:
+            action = "STOP"
+
+        analysis = data.get("analysis")
+        if not isinstance(analysis, dict):
+            analysis = self._fallback_analysis(
+                service, location, [vendors[i] for i in vendor_ids]
+            )
+
+        return {
+            "vendor_ids": vendor_ids,
+            "reasoning": data.get("reasoning"),
+            "analysis": analysis,
+            "action": action
+        }
+
+    def _fallback_reasoning(
+        self,
+        service: str,
+        location: str,
+        vendors: List[Dict],
+        error: Optional[str] = None
+    ) -> Dict:
+        return {
+            "vendor_ids": list(range(len(vendors))),
+            "reasoning": "Deterministic ranking retained.",
+            "analysis": self._fallback_analysis(service, location, vendors, error=error),
+            "action": "STOP"
+        }
+
     # ==============================================================
     # PROMPTS & UTILITIES
     # ==============================================================
@@ -149,27 +447,43 @@ Required JSON format:
             for v in vendors[:5]
         ]
 
-        return f"""
-User searched for "{service}" vendors in "{location}".
+        return self.ANALYSIS_PROMPT.substitute(
+            service=service,
+            location=location,
+            vendors=self._to_json(summary)
+        )
 
-Top candidates (JSON):
-{summary}
+    def _complete(self, prompt: str, temperature: float) -> str:
+        """One JSON-mode chat completion; returns the raw message content."""
+        key = (prompt, temperature)
+        with self._completion_cache_lock:
+            content = self._completion_cache.get(key)
+        if content is not None:
+            return content
+
+        response = self.client.chat.completions.create(
+            model=self.MODEL,
+            temperature=temperature,
+            response_format={"type": "json_object"},
+            messages=[
+                self._system_message,
+                {"role": "user", "content": prompt}
+            ]
+        )
+        content = response.choices[0].message.content
 
-Tasks:
-1. Explain briefly how vendors were selected.
-2. Rate result quality: good / average / weak.
-3. Ask ONE clarifying question if needed, otherwise say "NO_QUESTION".
+        with self._completion_cache_lock:
+            self._completion_cache[key] = content
+        return content
 
-Respond ONLY in JSON with keys:
-- explanation
-- result_quality
-- clarifying_question
-"""
+    @staticmethod
+    def _to_json(data) -> str:
+        """Compact canonical JSON for prompts (fewer tokens than str(dict))."""
+        return orjson.dumps(data).decode()
 
     def _safe_json(self, content: str) -> Dict:
-        import json
         try:
-            return json.loads(content)
+            return orjson.loads(content)
         except Exception:
             return {
                 "explanation": content,
@@ -222,82 +536,15 @@ Respond ONLY in JSON with keys:
             for v in vendors
         ]
 
-        prompt = f"""
-    User searched for "{service}" vendors in "{location}" on "{platform}".
-
-    Current results (JSON):
-    {vendor_summary}
-
-    Decide ONE action:
-    - STOP
-    - EXPAND_LOCATION
-    - TRY_ANOTHER_PLATFORM
-    - RELAX_CONFIDENCE
-
-    Rules:
-    - Choose STOP if results are acceptable.
-    - Choose ONLY ONE action.
-    - Do NOT invent data.
-
-    Respond ONLY in JSON:
-    {{ "action": "<ACTION_NAME>" }}
-    """
+        prompt = self.NEXT_SEARCH_PROMPT.substitute(
+            service=service,
+            location=location,
+            platform=platform,
+            vendors=self._to_json(vendor_summary)
+        )
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                temperature=0,
-                messages=[
-                    {"role": "system", "content": self._system_prompt()},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            return self._safe_json(response.choices[0].message.content)
+            return self._safe_json(self._complete(prompt, temperature=0))
 
         except Exception:
             return {"action": "STOP"}
-
-    def is_actual_vendor(self, service: str, vendor: Dict) -> bool:
-        """
-        LLM-based intent classification.
-        """
-
-        if not self.client:
-            return True  # fallback: allow deterministic path
-
-        identity = vendor.get("identity", {})
-        contacts = vendor.get("contacts", {})
-        social = vendor.get("social", {})
-
-        prompt = f"""
-    You are evaluating whether an online account is a REAL SERVICE VENDOR.
-
-    Service: {service}
-
-    Account details:
-    Name: {identity.get("name")}
-    URL: {identity.get("url")}
-    Has WhatsApp: {bool(contacts.get("whatsapp"))}
-    Has Instagram: {bool(social.get("instagram"))}
-
-    Question:
-    Is this account offering services, or is it just content, news, or discussion?
-
-    Respond ONLY in JSON:
-    {{ "is_vendor": true | false }}
-    """
-
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                temperature=0,
-                messages=[
-                    {"role": "system", "content": self._system_prompt()},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            result = self._safe_json(response.choices[0].message.content)
-            return bool(result.get("is_vendor"))
-
-        except Exception:
-            return True
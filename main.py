@@ -1,50 +1,87 @@
-from fastapi import FastAPI, Query
+import asyncio
+import heapq
+import httpx
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from vendor_finder import VendorFinder
+from search_cache import SearchCache
+from config import Config
 
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-import os
+from fastapi.responses import ORJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared resources: built once per worker, released on shutdown
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=10,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+    app.state.cache = SearchCache(namespace="web")
+    app.state.finder = VendorFinder()
+
+    yield
+
+    await asyncio.to_thread(app.state.finder.close)
+    await app.state.http.aclose()
+    await app.state.cache.close()
+
 
 app = FastAPI(
     title="AI Vendor Finder",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Allow frontend to call backend
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # OK for demo
+    allow_origins=Config.CORS_ORIGINS.split(","),  # "*" is OK for demo
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
-finder = VendorFinder()
-
 # @app.get("/")
 # def health_check():
 #     return {"status": "ok"}
 
-# 1. Update the root route to serve your HTML file
-@app.get("/")
-def serve_frontend():
-    return FileResponse(os.path.join("static", "index.html"))
+# Compress HTML / JSON responses (large vendor lists shrink ~2x)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
-# 2. Mount the static directory (so it can find CSS/JS/Images if you add them)
+# Mount the static directory (so it can find CSS/JS/Images if you add them)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
 @app.get("/search")
-def search_vendors(
+async def search_vendors(
+    request: Request,
     service: str = Query(..., description="Service or product (e.g. plumber, cake, photographer)"),
-    location: str = Query(..., description="City or area (e.g. Abuja, Lagos)")
+    location: str = Query(..., description="City or area (e.g. Abuja, Lagos)"),
+    max_results: int = Query(5, ge=1, le=20)
 ):
     """
     Search for local vendors by service and location.
     """
 
-    result = finder.find_vendors(service, location)
+    state = request.app.state
+
+    key = state.cache.key(service, location, max_results)
+    cached = await state.cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = await state.finder.find_vendors_async(
+        service,
+        location,
+        client=state.http
+    )
 
     # Handle both list and dict return types safely
     if isinstance(result, dict):
@@ -52,20 +89,15 @@ def search_vendors(
     else:
         vendors = result
 
-    # Optional: filter out very weak vendors (recommended)
-    vendors = [
-        v for v in vendors
-        if v.get("confidence_score", 0) >= 0.5
-    ]
-
-    vendors = sorted(
-        vendors,
-        key=lambda v: v.get("confidence_score", 0),
-        reverse=True
+    # Optional: filter out very weak vendors (recommended), then keep
+    # only the top max_results (O(n log k) instead of a full sort)
+    vendors = heapq.nlargest(
+        max_results,
+        (v for v in vendors if v.get("confidence_score", 0) >= 0.5),
+        key=lambda v: v.get("confidence_score", 0)
     )
 
-
-    return {
+    response = {
         "query": {
             "service": service,
             "location": location
@@ -73,3 +105,13 @@ def search_vendors(
         "total_vendors": len(vendors),
         "vendors": vendors
     }
+
+    if vendors:
+        await state.cache.set(key, response)
+
+    return response
+
+
+# Serve the frontend (static/index.html) at the root. Mounted last so the
+# catch-all mount doesn't shadow the API routes above.
+app.mount("/", StaticFiles(directory="static", html=True), name="root")
@@ -0,0 +1,64 @@
+"""
+Response cache for the /search endpoints (Redis-backed).
+
+Repeated (service, location, platform, ...) queries are served from Redis
+instead of re-running the full search + extraction + LLM pipeline.
+Caching is best-effort: if REDIS_URL is unset, the redis package is
+missing, or Redis is unreachable, every lookup is simply a miss.
+"""
+
+import hashlib
+import orjson
+from typing import Dict, Optional
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+from config import Config
+
+
+CACHE_VERSION = "v1"
+
+
+class SearchCache:
+    """Namespaced JSON cache for search responses."""
+
+    def __init__(self, namespace: str, url: str = Config.REDIS_URL, ttl: int = Config.SEARCH_CACHE_TTL):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.client = None
+        if redis and url:
+            # Raw bytes: orjson reads them directly, no str decode step
+            self.client = redis.Redis.from_url(url)
+
+    def key(self, *parts) -> str:
+        """Stable key for a query; string parts are case/whitespace-normalized."""
+        raw = "|".join(
+            p.strip().lower() if isinstance(p, str) else str(p)
+            for p in parts
+        )
+        digest = hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+        return f"vf:{CACHE_VERSION}:{self.namespace}:{digest}"
+
+    async def get(self, key: str) -> Optional[Dict]:
+        if not self.client:
+            return None
+        try:
+            hit = await self.client.get(key)
+        except Exception:
+            return None
+        return orjson.loads(hit) if hit else None
+
+    async def set(self, key: str, value: Dict):
+        if not self.client:
+            return
+        try:
+            await self.client.setex(key, self.ttl, orjson.dumps(value))
+        except Exception:
+            pass
+
+    async def close(self):
+        if self.client:
+            await self.client.aclose()
@@ -8,196 +8,892 @@ Responsible for:
 - Preparing search evidence for downstream AI reasoning
 """
 
-import requests
+import asyncio
+import functools
+import heapq
+import httpx
+import operator
+import orjson
+import random
+import re
+import threading
 import time
-from typing import List, Dict
+import types
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from email.utils import parsedate_to_datetime
+from typing import Callable, List, Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit, parse_qsl
 from config import Config
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+GOOGLE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+
+# Largest page each API serves per request; bigger pages = fewer round-trips
+GOOGLE_PAGE_SIZE = 10
+GOOGLE_MAX_RESULTS = 100  # CSE never serves results past #100
+BING_PAGE_SIZE = 50
+
+# Fail fast on dead hosts (connect), allow slow responses (read)
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=3.05)
+
+# Search APIs return very compressible JSON; only offer br when httpx can
+# decode it (the brotli package is installed)
+SEARCH_HEADERS = types.MappingProxyType({
+    "User-Agent": "vendor-finder/1.0",
+    "Accept-Encoding": "br, gzip" if brotli else "gzip",
+})
+
+# Read-only: shared by every query builder call
+SITE_MAP = types.MappingProxyType({
+    "instagram": "site:instagram.com",
+    "twitter": "site:twitter.com",
+    "x": "site:twitter.com",
+    "facebook": "site:facebook.com",
+    "tiktok": "site:tiktok.com",
+})
+
+# C-level sort key, cheaper than a lambda per comparison
+_SORT_KEY = operator.attrgetter("relevance_score")
+
+# Query variants OR-packed into one Google request: "(a) OR (b) OR (c)"
+GOOGLE_OR_PACK = 3
+QUOTED_PHRASE = re.compile(r'"([^"]+)"')
+
+# Below this many results plain Python scoring beats NumPy's setup cost
+VECTORIZE_MIN_RESULTS = 64
+
+# Query keys that only track the click, never change the page
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "igshid", "msclkid"})
+
+# Worker threads for the sync fan-out used inside a running event loop
+SYNC_FANOUT_WORKERS = 8
+
+# Attempts per search API call; 429/5xx answers are retried with backoff
+MAX_ATTEMPTS = 3
+MAX_RETRY_WAIT = 30.0
+
+# Random extra wait when throttled, so concurrent waiters don't wake in lockstep
+RATE_LIMIT_JITTER = 0.05
+
+
+@dataclass(slots=True)
+class SearchHit:
+    """One search API result; slots keep big result sets compact."""
+
+    title: str
+    link: str
+    snippet: str
+    source: str
+    query_used: str
+    relevance_score: float = 0.0
+
+    # Casefolded once at ingestion; retagging and scoring match on these
+    title_cf: str = field(init=False, repr=False, compare=False)
+    snippet_cf: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.title_cf = self.title.casefold()
+        self.snippet_cf = self.snippet.casefold()
+
+    def to_dict(self) -> Dict:
+        return {
+            "title": self.title,
+            "link": self.link,
+            "snippet": self.snippet,
+            "source": self.source,
+            "query_used": self.query_used,
+            "relevance_score": self.relevance_score,
+        }
+
+
+class ScoreWatch:
+    """
+    Running top-k relevance scores during a query fan-out; tells the
+    caller when k distinct results already clear the threshold and every
+    engine in `engines` has returned hits (so one big page from a single
+    engine can't crowd out the other).
+    """
+
+    def __init__(
+        self,
+        scorer: Callable[[SearchHit], float],
+        k: int,
+        threshold: float,
+        engines: frozenset
+    ):
+        self.scorer = scorer
+        self.k = k
+        self.threshold = threshold
+        self.engines = engines
+        self._top: List[float] = []
+        self._seen = set()
+        self._engines_seen = set()
+
+    def add(self, hits: List[SearchHit]) -> bool:
+        """Feed one call's hits; True once the fan-out can stop."""
+        for hit in hits:
+            if not hit.link:
+                continue
+            url_key = SearchEngine._normalize_url(hit.link)
+            if url_key in self._seen:
+                continue
+            self._seen.add(url_key)
+            self._engines_seen.add(hit.source)
+
+            score = self.scorer(hit)
+            if len(self._top) < self.k:
+                heapq.heappush(self._top, score)
+            elif score > self._top[0]:
+                heapq.heapreplace(self._top, score)
+
+        return (
+            len(self._top) >= self.k
+            and self._top[0] >= self.threshold
+            and self._engines_seen >= self.engines
+        )
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: bursts up to `capacity` requests, then
+    refills at `refill_per_sec`. Safe to share across threads and tasks.
+    """
+
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, n: int = 1) -> float:
+        """Take n tokens (going into debt if empty) and return the wait owed."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.last_refill) * self.refill_per_sec
+            )
+            self.last_refill = now
+            self.tokens -= n
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.refill_per_sec + random.uniform(0, RATE_LIMIT_JITTER)
+
+    def acquire(self, n: int = 1):
+        delay = self.reserve(n)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, n: int = 1):
+        delay = self.reserve(n)
+        if delay:
+            await asyncio.sleep(delay)
+
 
 class SearchEngine:
     """Handles intelligent search operations using Google and Bing APIs."""
 
-    def __init__(self):
+    def __init__(self, http: Optional[httpx.Client] = None):
         self.google_api_key = Config.GOOGLE_API_KEY
         self.google_engine_id = Config.GOOGLE_SEARCH_ENGINE_ID
         self.bing_api_key = Config.BING_API_KEY
         self.bing_endpoint = Config.BING_SEARCH_ENDPOINT
 
-        self.last_request_time = 0
-        self.min_request_interval = 60 / max(Config.MAX_REQUESTS_PER_MINUTE, 1)
+        # Separate budgets so Google throttling never stalls Bing
+        rate = max(Config.MAX_REQUESTS_PER_MINUTE, 1)
+        self.google_bucket = TokenBucket(rate, rate / 60)
+        self.bing_bucket = TokenBucket(rate, rate / 60)
+
+        # Parsed results per (engine, query, num_results); repeat searches
+        # for the same service/location skip the network entirely
+        self._cache = TTLCache(maxsize=512, ttl=Config.ENGINE_CACHE_TTL)
+        self._cache_lock = threading.Lock()
+
+        # HTTP/2: parallel queries to one search host share a single
+        # TCP/TLS connection. httpx.Client is safe to share across threads,
+        # so a caller may pass its own (it stays open on close()).
+        self._owns_client = http is None
+        # Pool limits live on the transport: httpx ignores Client-level
+        # http2/limits once a transport is given.
+        self.client = http or httpx.Client(
+            headers=dict(SEARCH_HEADERS),
+            timeout=REQUEST_TIMEOUT,
+            transport=httpx.HTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=8),
+                retries=3
+            )
+        )
+
+    def close(self):
+        if self._owns_client:
+            self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # RESULT CACHE
+    # ------------------------------------------------------------------
+
+    def _cached(self, key: tuple) -> Optional[List[SearchHit]]:
+        with self._cache_lock:
+            hit = self._cache.get(key)
+        # Hand out copies: retagging and scoring mutate hits
+        return [replace(r) for r in hit] if hit is not None else None
+
+    def _store(self, key: tuple, results: List[SearchHit]) -> List[SearchHit]:
+        # Empty lists usually mean a failed call; don't pin those
+        if results:
+            with self._cache_lock:
+                self._cache[key] = tuple(replace(r) for r in results)
+        return results
+
+    # ------------------------------------------------------------------
+    # RETRIES
+    # ------------------------------------------------------------------
+
+    def _get(self, bucket: TokenBucket, url: str, **kwargs) -> httpx.Response:
+        """GET through the rate limiter, retrying 429/5xx answers."""
+        # Per request, so a shared client without our defaults behaves the same
+        kwargs["headers"] = {**SEARCH_HEADERS, **kwargs.get("headers", {})}
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+
+        for attempt in range(MAX_ATTEMPTS):
+            bucket.acquire()
+            response = self.client.get(url, **kwargs)
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                break
+            time.sleep(delay)
+        return response
+
+    async def _get_async(
+        self,
+        client: httpx.AsyncClient,
+        bucket: TokenBucket,
+        url: str,
+        **kwargs
+    ) -> httpx.Response:
+        """_get for an AsyncClient: same headers, timeout and retries."""
+        kwargs["headers"] = {**SEARCH_HEADERS, **kwargs.get("headers", {})}
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+
+        for attempt in range(MAX_ATTEMPTS):
+            await bucket.acquire_async()
+            response = await client.get(url, **kwargs)
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        return response
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> Optional[float]:
+        """
+        Seconds to wait before retrying, or None when the response is final
+        (success, non-retryable error, or attempts exhausted). Honors the
+        server's Retry-After on 429/503, else exponential backoff + jitter.
+        """
+        status = response.status_code
+        if attempt + 1 >= MAX_ATTEMPTS or (status != 429 and status < 500):
+            return None
+
+        if status in (429, 503):
+            retry_after = SearchEngine._parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, MAX_RETRY_WAIT) + random.uniform(0, 0.3)
+
+        return min(MAX_RETRY_WAIT, 2 ** attempt + random.uniform(0, 1))
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After is either delta-seconds or an HTTP-date."""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
 
     # ------------------------------------------------------------------
-    # RATE LIMITING
+    # PAGINATION
     # ------------------------------------------------------------------
 
-    def _rate_limit(self):
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+    @staticmethod
+    def _page_offsets(num_results: int, page_size: int, limit: Optional[int] = None) -> range:
+        """Result offsets of the pages needed to collect num_results."""
+        if limit is not None:
+            num_results = min(num_results, limit)
+        return range(0, num_results, page_size)
 
     # ------------------------------------------------------------------
     # QUERY GENERATION (INTELLIGENCE LAYER)
     # ------------------------------------------------------------------
 
-    def build_queries(self, service: str, location: str, platform: str) -> List[str]:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def build_queries(service: str, location: str, platform: str) -> Tuple[str, ...]:
         """
         Build multiple query variants to improve recall.
-        """
-        site_map = {
-            "instagram": "site:instagram.com",
-            "twitter": "site:twitter.com",
-            "x": "site:twitter.com",
-            "facebook": "site:facebook.com",
-            "tiktok": "site:tiktok.com",
-        }
 
-        site = site_map.get(platform.lower(), "")
+        Memoized (agent retries repeat the same triple), so the result is
+        an immutable tuple; use list(...) to modify it.
+        """
+        site = SITE_MAP.get(platform.lower(), "")
 
         base_queries = [
-            f'{site} "{service} vendor {location}"',
-            f'{site} "{service} in {location}"',
-            f'{site} "{service}" "{location}"',
-            f'{site} "{service}" whatsapp "{location}"',
+            f"{site} {variant}" for variant in SearchEngine._query_variants(service, location)
         ]
 
         # Remove empty site searches
-        return [q.strip() for q in base_queries if q.strip()]
+        return tuple(q.strip() for q in base_queries if q.strip())
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def build_google_queries(
+        service: str,
+        location: str,
+        platform: str
+    ) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+        """
+        OR-pack the query variants so one Google request covers up to
+        GOOGLE_OR_PACK of them. Returns (packed_query, variant_queries) pairs.
+        """
+        site = SITE_MAP.get(platform.lower(), "")
+        variants = SearchEngine._query_variants(service, location)
+
+        packs = []
+        for i in range(0, len(variants), GOOGLE_OR_PACK):
+            group = variants[i:i + GOOGLE_OR_PACK]
+            packed = " OR ".join(f"({v})" for v in group) if len(group) > 1 else group[0]
+            packs.append((
+                f"{site} {packed}".strip(),
+                tuple(f"{site} {v}".strip() for v in group)
+            ))
+        return tuple(packs)
+
+    @staticmethod
+    def _query_variants(service: str, location: str) -> List[str]:
+        return [
+            f'"{service} vendor {location}"',
+            f'"{service} in {location}"',
+            f'"{service}" "{location}"',
+            f'"{service}" whatsapp "{location}"',
+        ]
+
+    @staticmethod
+    def _retag_packed(results: List[SearchHit], variants: Tuple[str, ...]) -> List[SearchHit]:
+        """
+        Point query_used at the first variant whose quoted phrases all occur
+        in the hit; hits matching none keep the packed query.
+        """
+        if len(variants) < 2:
+            return results
+
+        needed = [
+            (v, frozenset(p.casefold() for p in QUOTED_PHRASE.findall(v)))
+            for v in variants
+        ]
+        # Longest first so a full phrase wins over its own sub-phrase
+        phrases = sorted(set().union(*(n for _, n in needed)), key=len, reverse=True)
+        pattern = re.compile("|".join(map(re.escape, phrases)))
+
+        for result in results:
+            text = f"{result.title_cf} {result.snippet_cf}"
+            found = set(pattern.findall(text))
+            for variant, phrase_set in needed:
+                if phrase_set <= found:
+                    result.query_used = variant
+                    break
+        return results
 
     # ------------------------------------------------------------------
     # GOOGLE SEARCH
     # ------------------------------------------------------------------
 
-    def search_google(self, query: str, num_results: int = 10) -> List[Dict]:
+    def search_google(self, query: str, num_results: int = GOOGLE_PAGE_SIZE) -> List[SearchHit]:
         if not self.google_api_key or not self.google_engine_id:
             return []
 
-        self._rate_limit()
+        key = ("google", query, num_results)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
 
-        url = "https://www.googleapis.com/customsearch/v1"
-        params = {
-            "key": self.google_api_key,
-            "cx": self.google_engine_id,
-            "q": query,
-            "num": min(num_results, 10),
-        }
+        results: List[SearchHit] = []
+        for offset in self._page_offsets(num_results, GOOGLE_PAGE_SIZE, GOOGLE_MAX_RESULTS):
+            page = self._search_google_page(query, offset, num_results)
+            results.extend(page)
+            if len(page) < GOOGLE_PAGE_SIZE:
+                break
+
+        return self._store(key, results[:num_results])
 
+    def _search_google_page(self, query: str, offset: int, num_results: int) -> List[SearchHit]:
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get(
+                self.google_bucket,
+                GOOGLE_SEARCH_URL,
+                params=self._google_params(query, offset, num_results)
+            )
             response.raise_for_status()
-            data = response.json()
-
-            results = []
-            for item in data.get("items", []):
-                results.append({
-                    "title": item.get("title", ""),
-                    "link": item.get("link", ""),
-                    "snippet": item.get("snippet", ""),
-                    "source": "google",
-                    "query_used": query
-                })
+            return self._parse_google(orjson.loads(response.content), query)
 
-            return results
+        except (httpx.HTTPError, ValueError):
+            return []
 
-        except requests.exceptions.RequestException:
+    async def search_google_async(
+        self,
+        client: httpx.AsyncClient,
+        query: str,
+        num_results: int = GOOGLE_PAGE_SIZE
+    ) -> List[SearchHit]:
+        if not self.google_api_key or not self.google_engine_id:
             return []
 
+        key = ("google", query, num_results)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        pages = await asyncio.gather(*(
+            self._search_google_page_async(client, query, offset, num_results)
+            for offset in self._page_offsets(num_results, GOOGLE_PAGE_SIZE, GOOGLE_MAX_RESULTS)
+        ))
+
+        return self._store(key, [r for page in pages for r in page][:num_results])
+
+    async def _search_google_page_async(
+        self,
+        client: httpx.AsyncClient,
+        query: str,
+        offset: int,
+        num_results: int
+    ) -> List[SearchHit]:
+        try:
+            response = await self._get_async(
+                client,
+                self.google_bucket,
+                GOOGLE_SEARCH_URL,
+                params=self._google_params(query, offset, num_results)
+            )
+            response.raise_for_status()
+            return self._parse_google(orjson.loads(response.content), query)
+
+        except (httpx.HTTPError, ValueError):
+            return []
+
+    def _google_params(self, query: str, offset: int, num_results: int) -> Dict:
+        params = {
+            "key": self.google_api_key,
+            "cx": self.google_engine_id,
+            "q": query,
+            "num": min(num_results - offset, GOOGLE_PAGE_SIZE),
+        }
+        if offset:
+            params["start"] = offset + 1
+        return params
+
+    @staticmethod
+    def _parse_google(data: Dict, query: str) -> List[SearchHit]:
+        return [
+            SearchHit(
+                title=item.get("title", ""),
+                link=item.get("link", ""),
+                snippet=item.get("snippet", ""),
+                source="google",
+                query_used=query
+            )
+            for item in data.get("items", [])
+        ]
+
     # ------------------------------------------------------------------
     # BING SEARCH
     # ------------------------------------------------------------------
 
-    def search_bing(self, query: str, num_results: int = 10) -> List[Dict]:
+    def search_bing(self, query: str, num_results: int = BING_PAGE_SIZE) -> List[SearchHit]:
         if not self.bing_api_key:
             return []
 
-        self._rate_limit()
+        key = ("bing", query, num_results)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
 
-        headers = {
-            "Ocp-Apim-Subscription-Key": self.bing_api_key
-        }
-        params = {
-            "q": query,
-            "count": min(num_results, 50),
-            "textFormat": "Raw",
-        }
+        results: List[SearchHit] = []
+        for offset in self._page_offsets(num_results, BING_PAGE_SIZE):
+            page = self._search_bing_page(query, offset, num_results)
+            results.extend(page)
+            if len(page) < BING_PAGE_SIZE:
+                break
 
+        return self._store(key, results[:num_results])
+
+    def _search_bing_page(self, query: str, offset: int, num_results: int) -> List[SearchHit]:
         try:
-            response = requests.get(
+            response = self._get(
+                self.bing_bucket,
                 self.bing_endpoint,
-                headers=headers,
-                params=params,
-                timeout=10
+                headers=self._bing_headers(),
+                params=self._bing_params(query, offset, num_results)
             )
             response.raise_for_status()
-            data = response.json()
-
-            results = []
-            for item in data.get("webPages", {}).get("value", []):
-                results.append({
-                    "title": item.get("name", ""),
-                    "link": item.get("url", ""),
-                    "snippet": item.get("snippet", ""),
-                    "source": "bing",
-                    "query_used": query
-                })
+            return self._parse_bing(orjson.loads(response.content), query)
 
-            return results
+        except (httpx.HTTPError, ValueError):
+            return []
+
+    async def search_bing_async(
+        self,
+        client: httpx.AsyncClient,
+        query: str,
+        num_results: int = BING_PAGE_SIZE
+    ) -> List[SearchHit]:
+        if not self.bing_api_key:
+            return []
+
+        key = ("bing", query, num_results)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        pages = await asyncio.gather(*(
+            self._search_bing_page_async(client, query, offset, num_results)
+            for offset in self._page_offsets(num_results, BING_PAGE_SIZE)
+        ))
 
-        except requests.exceptions.RequestException:
+        return self._store(key, [r for page in pages for r in page][:num_results])
+
+    async def _search_bing_page_async(
+        self,
+        client: httpx.AsyncClient,
+        query: str,
+        offset: int,
+        num_results: int
+    ) -> List[SearchHit]:
+        try:
+            response = await self._get_async(
+                client,
+                self.bing_bucket,
+                self.bing_endpoint,
+                headers=self._bing_headers(),
+                params=self._bing_params(query, offset, num_results)
+            )
+            response.raise_for_status()
+            return self._parse_bing(orjson.loads(response.content), query)
+
+        except (httpx.HTTPError, ValueError):
             return []
 
+    def _bing_headers(self) -> Dict:
+        return {
+            "Ocp-Apim-Subscription-Key": self.bing_api_key
+        }
+
+    @staticmethod
+    def _bing_params(query: str, offset: int, num_results: int) -> Dict:
+        params = {
+            "q": query,
+            "count": min(num_results - offset, BING_PAGE_SIZE),
+            "textFormat": "Raw",
+        }
+        if offset:
+            params["offset"] = offset
+        return params
+
+    @staticmethod
+    def _parse_bing(data: Dict, query: str) -> List[SearchHit]:
+        return [
+            SearchHit(
+                title=item.get("name", ""),
+                link=item.get("url", ""),
+                snippet=item.get("snippet", ""),
+                source="bing",
+                query_used=query
+            )
+            for item in data.get("webPages", {}).get("value", [])
+        ]
+
     # ------------------------------------------------------------------
     # MAIN SEARCH ORCHESTRATION
     # ------------------------------------------------------------------
 
-    def search_vendors(self, service: str, location: str, platform: str) -> List[Dict]:
+    def search_vendors(
+        self,
+        service: str,
+        location: str,
+        platform: str,
+        top_k: Optional[int] = Config.SEARCH_TOP_K
+    ) -> List[Dict]:
         """
         Perform intelligent multi-query search for vendors.
+
+        Returns the top_k best-scoring results (all of them if top_k is
+        falsy). The blocking calls are overlapped on a thread pool over
+        self.client, so keep-alive connections carry over between searches.
+        """
+        calls = [
+            lambda packed=packed, variants=variants: self._retag_packed(
+                self.search_google(packed), variants
+            )
+            for packed, variants in self.build_google_queries(service, location, platform)
+        ]
+        calls.extend(
+            lambda query=query: self.search_bing(query)
+            for query in self.build_queries(service, location, platform)
+        )
+
+        watch = self._score_watch(service, location, platform, top_k)
+        batches: List[List[SearchHit]] = [[] for _ in calls]
+
+        pool = ThreadPoolExecutor(max_workers=SYNC_FANOUT_WORKERS)
+        try:
+            futures = {pool.submit(call): i for i, call in enumerate(calls)}
+            for future in as_completed(futures):
+                batches[futures[future]] = future.result()
+                # Enough strong hits already: stop waiting on the rest
+                if watch and watch.add(batches[futures[future]]):
+                    break
+
+            # Keep calls that finished while the watch was being fed
+            for future, i in futures.items():
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    batches[i] = future.result()
+        finally:
+            # Drop calls not yet started; in-flight ones finish unawaited
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        # Call order, not completion order, so ties rank stably
+        raw_results = [hit for batch in batches for hit in batch]
+
+        return self._dedupe_and_score(raw_results, service, location, platform, top_k)
+
+    async def search_vendors_async(
+        self,
+        service: str,
+        location: str,
+        platform: str,
+        client: httpx.AsyncClient,
+        top_k: Optional[int] = Config.SEARCH_TOP_K
+    ) -> List[Dict]:
         """
-        queries = self.build_queries(service, location, platform)
+        Async variant of search_vendors.
 
-        raw_results: List[Dict] = []
+        All Google/Bing calls for every query variant are issued concurrently
+        over the shared client, so latency tracks the slowest call rather
+        than the sum of all calls. Calls still pending (e.g. waiting on the
+        rate limiter) are cancelled once top_k strong hits are in.
+        """
+        calls = [
+            self._search_google_packed_async(client, packed, variants)
+            for packed, variants in self.build_google_queries(service, location, platform)
+        ]
+        calls.extend(
+            self.search_bing_async(client, query)
+            for query in self.build_queries(service, location, platform)
+        )
+
+        tasks = [asyncio.ensure_future(call) for call in calls]
+        watch = self._score_watch(service, location, platform, top_k)
+
+        try:
+            for done in asyncio.as_completed(tasks):
+                try:
+                    batch = await done
+                except Exception:
+                    # One failed call (e.g. malformed JSON) must not sink the rest
+                    continue
+                if watch and watch.add(batch):
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-        for query in queries:
-            raw_results.extend(self.search_google(query))
-            raw_results.extend(self.search_bing(query))
+        # Collect in call order (not completion order) so ties rank stably
+        raw_results: List[SearchHit] = []
+        for task in tasks:
+            if not task.cancelled() and task.exception() is None:
+                raw_results.extend(task.result())
 
-        # ------------------------------------------------------------------
-        # DEDUPLICATION & BASIC SCORING
-        # ------------------------------------------------------------------
+        return self._dedupe_and_score(raw_results, service, location, platform, top_k)
 
+    async def _search_google_packed_async(
+        self,
+        client: httpx.AsyncClient,
+        packed: str,
+        variants: Tuple[str, ...]
+    ) -> List[SearchHit]:
+        results = await self.search_google_async(client, packed)
+        return self._retag_packed(results, variants)
+
+    def _score_watch(
+        self,
+        service: str,
+        location: str,
+        platform: str,
+        top_k: Optional[int]
+    ) -> Optional[ScoreWatch]:
+        threshold = Config.SEARCH_SATURATION_SCORE
+        engines = frozenset(
+            engine for engine, configured in (
+                ("google", self.google_api_key and self.google_engine_id),
+                ("bing", self.bing_api_key),
+            ) if configured
+        )
+        if not top_k or threshold <= 0 or not engines:
+            return None
+        # No platform bonus: every hit of a site: query gets it, so it says
+        # nothing about whether a hit is strong
+        return ScoreWatch(
+            self._scorer(service, location, platform, platform_bonus=False),
+            top_k,
+            threshold,
+            engines
+        )
+
+    # ------------------------------------------------------------------
+    # DEDUPLICATION & BASIC SCORING
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """
+        Dedup signature for a URL: ignores scheme, "www.", host case,
+        fragment, trailing slash and tracking query parameters.
+        """
+        parts = urlsplit(url.strip())
+        host = parts.netloc.lower()
+        if host.startswith("www."):
+            host = host[4:]
+
+        query = urlencode([
+            (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not k.startswith("utm_") and k not in TRACKING_PARAMS
+        ])
+
+        key = host + parts.path.rstrip("/")
+        return f"{key}?{query}" if query else key
+
+    def _dedupe_and_score(
+        self,
+        raw_results: List[SearchHit],
+        service: str,
+        location: str,
+        platform: str,
+        top_k: Optional[int] = None
+    ) -> List[Dict]:
+        """Dedupe and rank hits; returns plain dicts for downstream consumers."""
         seen_urls = set()
         unique_results = []
 
         for result in raw_results:
-            url = result.get("link")
-            if not url or url in seen_urls:
+            url = result.link
+            if not url:
                 continue
 
-            seen_urls.add(url)
+            url_key = self._normalize_url(url)
+            if url_key in seen_urls:
+                continue
 
-            # Lightweight relevance signal
-            relevance_score = 0.0
-            title = result.get("title", "").lower()
-            snippet = result.get("snippet", "").lower()
+            seen_urls.add(url_key)
+            unique_results.append(result)
 
-            if service.lower() in title:
-                relevance_score += 0.3
-            if location.lower() in snippet:
-                relevance_score += 0.3
-            if "whatsapp" in snippet or "wa.me" in snippet:
-                relevance_score += 0.2
-            if platform.lower() in result.get("query_used", "").lower():
-                relevance_score += 0.2
+        if np is not None and len(unique_results) > VECTORIZE_MIN_RESULTS:
+            ranked = self._score_vectorized(
+                unique_results, service.casefold(), location.casefold(), platform.casefold()
+            )
+            return [hit.to_dict() for hit in ranked[:top_k or None]]
 
-            result["relevance_score"] = round(min(relevance_score, 1.0), 2)
-            unique_results.append(result)
+        scorer = self._scorer(service, location, platform)
+        for result in unique_results:
+            result.relevance_score = scorer(result)
+
+        # Sort by relevance score (descending); a bounded heap when only
+        # the head is wanted. Both keep search order among equal scores.
+        if top_k:
+            unique_results = heapq.nlargest(top_k, unique_results, key=_SORT_KEY)
+        else:
+            unique_results.sort(key=_SORT_KEY, reverse=True)
+
+        return [hit.to_dict() for hit in unique_results]
+
+    @staticmethod
+    def _scorer(
+        service: str,
+        location: str,
+        platform: str,
+        platform_bonus: bool = True
+    ) -> Callable[[SearchHit], float]:
+        """Lightweight relevance signal for one hit, in [0, 1]."""
+        # Hits carry casefolded title/snippet, so plain substring tests need
+        # no per-hit allocation. query_used can be retagged after ingestion,
+        # hence a case-insensitive matcher for the platform instead.
+        service_cf = service.casefold()
+        location_cf = location.casefold()
+        match_platform = re.compile(re.escape(platform), re.IGNORECASE).search
+
+        def score(hit: SearchHit) -> float:
+            snippet = hit.snippet_cf
+            relevance_score = (
+                0.3 * (service_cf in hit.title_cf)
+                + 0.3 * (location_cf in snippet)
+                + 0.2 * ("whatsapp" in snippet or "wa.me" in snippet)
+                + 0.2 * (platform_bonus and match_platform(hit.query_used) is not None)
+            )
+            return round(min(relevance_score, 1.0), 2)
+
+        return score
+
+    @staticmethod
+    def _score_vectorized(
+        results: List[SearchHit],
+        service_cf: str,
+        location_cf: str,
+        platform_cf: str
+    ) -> List[SearchHit]:
+        """Same scoring as _dedupe_and_score, one NumPy pass per signal."""
+        titles = np.asarray([r.title_cf for r in results], dtype=str)
+        snippets = np.asarray([r.snippet_cf for r in results], dtype=str)
+        queries = np.asarray([r.query_used.casefold() for r in results], dtype=str)
 
-        # Sort by relevance score (descending)
-        unique_results.sort(key=lambda r: r["relevance_score"], reverse=True)
+        scores = (
+            0.3 * (np.char.find(titles, service_cf) >= 0)
+            + 0.3 * (np.char.find(snippets, location_cf) >= 0)
+            + 0.2 * ((np.char.find(snippets, "whatsapp") >= 0)
+                     | (np.char.find(snippets, "wa.me") >= 0))
+            + 0.2 * (np.char.find(queries, platform_cf) >= 0)
+        )
+        scores = np.round(np.minimum(scores, 1.0), 2)
 
-        return unique_results
+        # Stable, like list.sort, so equal scores keep search order
+        order = np.argsort(-scores, kind="stable").tolist()
+        ranked = []
+        for i in order:
+            results[i].relevance_score = float(scores[i])
+            ranked.append(results[i])
+        return ranked
 
 
 # """Search engine module for Google and Bing APIs."""
@@ -0,0 +1,32 @@
+# test_classify_service.py
+from vendor_finder import classify_service
+
+
+def test_whole_words():
+    assert classify_service("Plumber") == "trade"
+    assert classify_service("wedding cakes") == "visual"
+    assert classify_service("lawyer") == "general"
+
+
+def test_compound_words():
+    assert classify_service("cupcake") == "visual"
+    assert classify_service("cheesecakes") == "visual"
+    assert classify_service("aircon repairs") == "trade"
+    assert classify_service("carpetcleaners") == "trade"
+
+
+def test_no_substring_matches():
+    assert classify_service("fire prevention") == "general"
+    assert classify_service("eventual consistency consulting") == "general"
+    assert classify_service("cakewalk") == "general"
+
+
+def test_trade_wins_over_visual():
+    assert classify_service("event decor installer") == "trade"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -8,11 +8,11 @@ params = {
     "key": Config.GOOGLE_API_KEY,
     "cx": Config.GOOGLE_SEARCH_ENGINE_ID,  # This uses your 17-char ID
     "q": query,
-    "num": 3
+    "num": 10
 }
 
 try:
-    response = requests.get(url, params=params)
+    response = requests.get(url, params=params, timeout=10)
     print(f"Status Code: {response.status_code}")
     data = response.json()
     if "items" in data:
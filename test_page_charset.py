@@ -0,0 +1,54 @@
+# test_page_charset.py
+import io
+import requests
+from vendor_extractor import VendorExtractor, _decode_page
+
+LATIN1_PAGE = (
+    '<html><head><meta charset="iso-8859-1"><title>Café Lagos</title></head>'
+    '<body>Crème cakes, WhatsApp 08031234567</body></html>'
+).encode("latin-1")
+
+
+def test_meta_charset():
+    page_text, title = VendorExtractor._read_page(_decode_page(LATIN1_PAGE))
+    assert title == "Café Lagos", title
+    assert "Crème" in page_text, page_text
+
+
+def test_header_charset_wins():
+    page = "<title>Café</title>".encode("cp1252")
+    assert _decode_page(page, "text/html; charset=windows-1252") == "<title>Café</title>"
+
+
+def test_utf8_default():
+    assert _decode_page("<title>Café</title>".encode("utf-8")) == "<title>Café</title>"
+    # Cut mid-character by the page size cap: still read as UTF-8
+    assert _decode_page("Café".encode("utf-8")[:-1]).startswith("Caf")
+
+
+class _PageAdapter(requests.adapters.BaseAdapter):
+    """Serves LATIN1_PAGE without a charset in its Content-Type."""
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["content-type"] = "text/html"
+        response.raw = io.BytesIO(LATIN1_PAGE)
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def test_fetch_decodes_latin1():
+    with VendorExtractor() as extractor:
+        extractor.session.mount("https://", _PageAdapter())
+        assert "Café Lagos" in extractor.fetch_page_content("https://example.com")
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
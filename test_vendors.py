@@ -1,22 +1,39 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from vendor_finder import VendorFinder
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
 finder = VendorFinder()
 
-plumber_results = finder.find_vendors("plumber", "Abuja")
-electrician_results = finder.find_vendors("electrician", "Lagos")
-cake_results = finder.find_vendors("cake", "Lagos")
-photographer_results = finder.find_vendors("photographer", "Ibadan")
+searches = [
+    ("plumber", "Abuja"),
+    ("electrician", "Lagos"),
+    ("cake", "Lagos"),
+    ("photographer", "Ibadan"),
+]
+
+# Searches are network-bound, so run them side by side
+with ThreadPoolExecutor(max_workers=len(searches)) as ex:
+    plumber_results, electrician_results, cake_results, photographer_results = ex.map(
+        lambda st: finder.find_vendors(*st), searches
+    )
 
 def print_vendors(results, service, location):
     vendors = results.get("vendors", [])
-    print(f"\n🔹 {service.title()} in {location} — {len(vendors)} vendors found")
+    lines = [f"\n🔹 {service.title()} in {location} — {len(vendors)} vendors found"]
     for i, v in enumerate(vendors, 1):
-        print(f"Vendor #{i}: {v.get('name')} — Confidence: {v.get('confidence_score')}")
-        print(f"   URL: {v.get('url')}")
-        print(f"   Instagram: {v.get('instagram')}")
-        print(f"   WhatsApp: {v.get('whatsapp')}")
-        print(f"   Location: {v.get('location')}")
-        print("-" * 40)
+        lines += [
+            f"Vendor #{i}: {v.get('name')} — Confidence: {v.get('confidence_score')}",
+            f"   URL: {v.get('url')}",
+            f"   Instagram: {v.get('instagram')}",
+            f"   WhatsApp: {v.get('whatsapp')}",
+            f"   Location: {v.get('location')}",
+            "-" * 40,
+        ]
+    # One write per search instead of one per line
+    logger.info("\n".join(lines))
 
 print_vendors(plumber_results, "plumber", "Abuja")
 print_vendors(electrician_results, "electrician", "Lagos")
@@ -1,5 +1,10 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from vendor_finder import VendorFinder
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
 # ---------------- INITIALIZE FINDER ----------------
 finder = VendorFinder()
 
@@ -14,30 +19,37 @@ services_to_test = [
 # ---------------- HELPER FUNCTION ----------------
 def print_vendors(results, service, location):
     vendors = results.get("vendors", [])
-    print(f"\n🔹 {service.title()} in {location} — {len(vendors)} vendors found")
+    lines = [f"\n🔹 {service.title()} in {location} — {len(vendors)} vendors found"]
     for i, v in enumerate(vendors, 1):
         identity = v.get("identity", {})
         contacts = v.get("contacts", {})
         social = v.get("social", {})
         location_info = v.get("location", {})
 
-        print(f"Vendor #{i}: {identity.get('name', 'N/A')}")
-        print(f"   Confidence Score: {v.get('confidence_score')}")
-        print(f"   URL: {identity.get('url')}")
-        print(f"   Instagram: {', '.join(social.get('instagram', [])) or 'Not found'}")
-        print(f"   WhatsApp: {', '.join(contacts.get('whatsapp', [])) or 'Not found'}")
+        lines += [
+            f"Vendor #{i}: {identity.get('name', 'N/A')}",
+            f"   Confidence Score: {v.get('confidence_score')}",
+            f"   URL: {identity.get('url')}",
+            f"   Instagram: {', '.join(social.get('instagram', [])) or 'Not found'}",
+            f"   WhatsApp: {', '.join(contacts.get('whatsapp', [])) or 'Not found'}",
+        ]
 
         # Optional: Google Maps info
         gm = location_info.get("google_maps")
         if gm:
-            print(f"   Address: {gm.get('address')}")
+            lines.append(f"   Address: {gm.get('address')}")
             if gm.get("rating"):
-                print(f"   Rating: {gm.get('rating')}")
+                lines.append(f"   Rating: {gm.get('rating')}")
+
+        lines.append("-" * 40)
 
-        print("-" * 40)
+    # One write per search instead of one per line
+    logger.info("\n".join(lines))
 
 # ---------------- RUN TESTS ----------------
-for service, location in services_to_test:
-    print(f"\n🔎 Searching for '{service}' in '{location}' ...")
-    results = finder.find_vendors(service, location)
-    print_vendors(results, service, location)
+# Searches are network-bound, so run them side by side
+with ThreadPoolExecutor(max_workers=len(services_to_test)) as ex:
+    results = list(ex.map(lambda st: (st, finder.find_vendors(*st)), services_to_test))
+
+for (service, location), res in results:
+    print_vendors(res, service, location)
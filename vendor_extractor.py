@@ -6,13 +6,48 @@ infers contacts and location, enriches with Google Maps where possible,
 and produces confidence-scored vendor profiles.
 """
 
+import asyncio
+import codecs
+import hashlib
+import httpx
 import re
 import requests
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional
+import threading
+from cachetools import LRUCache, TTLCache
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Set, Tuple
 import googlemaps
 from config import Config
 
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+NOISE_TAGS = ["script", "style", "noscript"]
+
+
+PAGE_FETCH_TIMEOUT = 8
+# Pages are read up to this many bytes; vendor contact details sit well
+# inside it, and a runaway 50 MB page can't balloon memory or parse time
+MAX_PAGE_BYTES = 4_000_000
+PAGE_CHUNK_SIZE = 64 * 1024
+PAGE_ANALYSIS_CACHE_SIZE = 1024
+
+# Charset declarations: Content-Type header, then <meta> near the page top
+HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+CHARSET_SNIFF_BYTES = 4096
+
+# Marks "not cached" apart from a cached "no place found" (None)
+_MISSING = object()
 
 JOB_KEYWORDS = [
     "hiring", "salary", "vacancy", "apply",
@@ -20,61 +55,195 @@ JOB_KEYWORDS = [
     "recruiting", "opening", "employment"
 ]
 
+# Every contact pattern fused into one alternation, so page text is scanned
+# once; each alternative's named group holds the value and tells which
+# kind of contact matched. Earlier alternatives win at the same position.
+CONTACT_PATTERNS = (
+    r'wa\.me[/\+]?(?P<wa_link>\d+)',
+    r'whatsapp[:\s]*(?P<wa_label>[\+\d][\d\s\-]{9,})',
+    r'(?P<ng_phone>\+?234[\s\-]?\d{3}[\s\-]?\d{3}[\s\-]?\d{4})',
+    r'(?P<phone>\+?\d[\d\s\-]{9,})',
+    r'(?P<ig_url>https?://(?:www\.)?instagram\.com/[\w\.]+/?)',
+    r'(?P<ig_bare>instagram\.com/[\w\.]+/?)',
+    r'(?P<ig_handle>@[\w\.]{3,})',
+)
+CONTACT_RE = re.compile("|".join(CONTACT_PATTERNS), re.IGNORECASE)
+
+# Whole pages go through RE2 when available: linear-time matching, so the
+# unbounded quantifiers above can't backtrack badly on hostile HTML.
+# Short snippets aren't worth the switch and stay on `re`.
+PAGE_CONTACT_RE = re2.compile("(?i)" + "|".join(CONTACT_PATTERNS)) if re2 else CONTACT_RE
+PAGE_SCAN_MIN_CHARS = 1024
+PHONE_GROUPS = frozenset({"wa_link", "wa_label", "ng_phone", "phone"})
+
+NON_PHONE_CHARS = re.compile(r"[^\d+]")
+
+# Instagram post pages and news / job content are never vendor profiles
+BAD_URL_RE = re.compile(r"instagram\.com/p/|news|press|job|vacancy|salary", re.IGNORECASE)
+
+SOFT_SIGNALS = (
+    "order now",
+    "call us",
+    "dm us",
+    "whatsapp",
+    "delivery",
+    "we offer",
+    "our services",
+    "bookings",
+    "price",
+    "pricing",
+    "available",
+    "located in",
+    "based in",
+    "lagos",
+    "abuja",
+)
+
+
+# In priority order: when several appear, the earliest listed wins
+COMMON_LOCATIONS = (
+    "lagos", "abuja", "ibadan", "port harcourt", "ph",
+    "lekki", "ikeja", "ajah", "yaba", "surulere",
+    "ikorodu", "benin", "asaba", "uyo", "owerri"
+)
+
+
+def _build_automaton(words, values=None):
+    """Aho-Corasick automaton: finds every keyword in one pass over the text."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word, value in zip(words, values if values is not None else words):
+        automaton.add_word(word, value)
+    automaton.make_automaton()
+    return automaton
+
+
+JOB_AUTOMATON = _build_automaton(JOB_KEYWORDS)
+SOFT_SIGNAL_AUTOMATON = _build_automaton(SOFT_SIGNALS)
+# Values are priority ranks into COMMON_LOCATIONS
+LOCATION_AUTOMATON = _build_automaton(COMMON_LOCATIONS, range(len(COMMON_LOCATIONS)))
+
+
+def _decode_page(raw: bytes, content_type: Optional[str] = None) -> str:
+    """
+    Page bytes to text. Charset from a UTF-8 BOM, the Content-Type header
+    or a <meta> declaration, in that order; otherwise UTF-8, falling back
+    to cp1252 for undeclared legacy pages.
+    """
+    if raw.startswith(codecs.BOM_UTF8):
+        return raw[len(codecs.BOM_UTF8):].decode("utf-8", "replace")
+
+    declared = HEADER_CHARSET_RE.search(content_type or "")
+    if declared is None:
+        declared = META_CHARSET_RE.search(raw[:CHARSET_SNIFF_BYTES])
+    if declared is not None:
+        charset = declared.group(1)
+        charset = charset.decode("ascii") if isinstance(charset, bytes) else charset
+        try:
+            return raw.decode(charset, "replace")
+        except LookupError:
+            pass
+
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A character cut off by the MAX_PAGE_BYTES cap is still UTF-8
+        if e.start >= len(raw) - 3:
+            return raw.decode("utf-8", "replace")
+        return raw.decode("cp1252", "replace")
+
 
 
 class VendorExtractor:
     """Extracts, enriches, and scores vendor information."""
 
+    PAGE_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; VendorFinderBot/1.0)"}
+
     def __init__(self):
+        # Vendor pages span many hosts, fetched in parallel: wide pool so
+        # TLS handshakes are amortized across vendors on the same host
+        self.session = requests.Session()
+        self.session.headers.update(self.PAGE_HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Maps calls ride the same session, so they reuse its keep-alive pool
+        # instead of opening connections from a second one
         self.gmaps_client = None
         if Config.GOOGLE_MAPS_API_KEY and Config.GOOGLE_MAPS_API_KEY != "your_google_maps_api_key_here":
             try:
-                self.gmaps_client = googlemaps.Client(key=Config.GOOGLE_MAPS_API_KEY)
+                self.gmaps_client = googlemaps.Client(
+                    key=Config.GOOGLE_MAPS_API_KEY,
+                    requests_session=self.session
+                )
             except Exception as e:
                 print(f"Warning: Google Maps client not initialized: {e}")
 
+        # Paid Maps lookups keyed on the normalized query / rounded lat,lng;
+        # repeat vendors and common locations skip the API entirely
+        self._maps_cache = TTLCache(maxsize=4096, ttl=Config.MAPS_CACHE_TTL)
+        self._maps_cache_lock = threading.Lock()
+        # Caps Places calls in flight across every extraction thread (and
+        # concurrent searches) sharing this extractor
+        self._maps_slots = threading.BoundedSemaphore(max(Config.MAPS_CONCURRENCY, 1))
+
+        # Page scans keyed on a content hash, so never stale: directory
+        # pages reached from several results are only scanned once
+        self._analysis_cache = LRUCache(maxsize=PAGE_ANALYSIS_CACHE_SIZE)
+        self._analysis_cache_lock = threading.Lock()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     # ---------------------------------------------------------------------
     # CONTACT EXTRACTION
     # ---------------------------------------------------------------------
 
-    def extract_whatsapp_numbers(self, text: str) -> List[str]:
-        """Extract WhatsApp / phone numbers from text."""
-        patterns = [
-            r'wa\.me[/\+]?(\d+)',
-            r'whatsapp[:\s]*([\+\d][\d\s\-]{9,})',
-            r'(\+?234[\s\-]?\d{3}[\s\-]?\d{3}[\s\-]?\d{4})',
-            r'(\+?\d[\d\s\-]{9,})',
-        ]
-
+    def extract_contacts(self, text: str) -> Tuple[Set[str], Set[str]]:
+        """
+        Extract (WhatsApp / phone numbers, Instagram profile URLs) from text
+        in a single pass.
+        """
         numbers = set()
-        for pattern in patterns:
-            for match in re.findall(pattern, text, re.IGNORECASE):
-                cleaned = re.sub(r"[^\d+]", "", match)
+        links = set()
+
+        pattern = PAGE_CONTACT_RE if len(text) >= PAGE_SCAN_MIN_CHARS else CONTACT_RE
+        for m in pattern.finditer(text):
+            kind = m.lastgroup
+            match = m.group(kind)
+
+            if kind in PHONE_GROUPS:
+                cleaned = NON_PHONE_CHARS.sub("", match)
                 if len(cleaned) >= 10:
                     numbers.add(cleaned)
+            elif kind == "ig_handle":
+                links.add(f"https://instagram.com/{match[1:]}")
+            elif kind == "ig_url":
+                links.add(match)
+            else:
+                links.add(f"https://{match}")
+
+        return numbers, links
 
-        return list(numbers)
+    def extract_whatsapp_numbers(self, text: str) -> List[str]:
+        """Extract WhatsApp / phone numbers from text."""
+        return list(self.extract_contacts(text)[0])
 
     def extract_instagram_links(self, text: str) -> List[str]:
         """Extract Instagram profile URLs or handles."""
-        links = set()
-
-        patterns = [
-            r'https?://(www\.)?instagram\.com/[\w\.]+/?',
-            r'instagram\.com/[\w\.]+/?',
-            r'@[\w\.]{3,}',
-        ]
-
-        for pattern in patterns:
-            for match in re.findall(pattern, text, re.IGNORECASE):
-                if match.startswith("@"):
-                    links.add(f"https://instagram.com/{match[1:]}")
-                elif match.startswith("http"):
-                    links.add(match)
-                else:
-                    links.add(f"https://{match}")
-
-        return list(links)
+        return list(self.extract_contacts(text)[1])
 
     # ---------------------------------------------------------------------
     # LOCATION INFERENCE
@@ -84,58 +253,138 @@ class VendorExtractor:
         """
         Infer location from free text (Instagram bio, snippet, etc.)
         """
-        common_locations = [
-            "lagos", "abuja", "ibadan", "port harcourt", "ph",
-            "lekki", "ikeja", "ajah", "yaba", "surulere",
-            "ikorodu", "benin", "asaba", "uyo", "owerri"
-        ]
-
-        lowered = text.lower()
-        for loc in common_locations:
+        return self._location_in(text.lower()) or fallback_location or None
+
+    @staticmethod
+    def _location_in(lowered: str) -> Optional[str]:
+        """Highest-priority COMMON_LOCATIONS entry in already-lowercased text."""
+        if LOCATION_AUTOMATON is not None:
+            rank = min((r for _, r in LOCATION_AUTOMATON.iter(lowered)), default=None)
+            return COMMON_LOCATIONS[rank].title() if rank is not None else None
+
+        for loc in COMMON_LOCATIONS:
             if loc in lowered:
                 return loc.title()
+        return None
 
-        return fallback_location if fallback_location else None
+    def _analyze_page(self, page_text: str) -> Tuple[frozenset, frozenset, frozenset, Optional[str]]:
+        """
+        (numbers, instagram links, soft-signal words, location or None) for
+        page text, memoized by content hash.
+        """
+        key = hashlib.blake2b(page_text.encode(), digest_size=16).digest()
+        with self._analysis_cache_lock:
+            analysis = self._analysis_cache.get(key)
+        if analysis is not None:
+            return analysis
+
+        numbers, links = self.extract_contacts(page_text)
+        lowered = page_text.lower()
+        analysis = (
+            frozenset(numbers),
+            frozenset(links),
+            frozenset(self._soft_signal_words(lowered)),
+            self._location_in(lowered),
+        )
+        with self._analysis_cache_lock:
+            self._analysis_cache[key] = analysis
+        return analysis
 
     def enrich_with_google_maps(self, business_name: str, location: str) -> Optional[Dict]:
         """Enrich vendor with Google Maps data."""
         if not self.gmaps_client or not business_name:
             return None
 
+        query = f"{business_name} {location}"
+        key = self._places_key(query)
+        cached = self._maps_cached(key)
+        if cached is not _MISSING:
+            return cached
+
         try:
-            query = f"{business_name} {location}"
-            result = self.gmaps_client.places(query=query)
-
-            if result.get("results"):
-                place = result["results"][0]
-                geo = place.get("geometry", {}).get("location", {})
-
-                return {
-                    "address": place.get("formatted_address"),
-                    "latitude": geo.get("lat"),
-                    "longitude": geo.get("lng"),
-                    "rating": place.get("rating"),
-                    "place_id": place.get("place_id"),
-                    "source": "google_maps"
-                }
+            with self._maps_slots:
+                place = self._place_summary(self.gmaps_client.places(query=query))
+            return self._maps_store(key, place)
         except Exception as e:
             print(f"Google Maps enrichment error: {e}")
 
         return None
 
+    @staticmethod
+    def _places_key(query: str) -> str:
+        return f"places::{' '.join(query.lower().split())}"
+
+    def _maps_cached(self, key: str):
+        with self._maps_cache_lock:
+            hit = self._maps_cache.get(key, _MISSING)
+        # Copy: callers fill in addresses on the returned dict
+        return dict(hit) if isinstance(hit, dict) else hit
+
+    def _maps_store(self, key: str, value):
+        """Cache a successful lookup (including "nothing found") and return it."""
+        with self._maps_cache_lock:
+            self._maps_cache[key] = dict(value) if isinstance(value, dict) else value
+        return value
+
+    @staticmethod
+    def _place_summary(result: Dict) -> Optional[Dict]:
+        if not result.get("results"):
+            return None
+
+        place = result["results"][0]
+        geo = place.get("geometry", {}).get("location", {})
+
+        return {
+            "address": place.get("formatted_address"),
+            "latitude": geo.get("lat"),
+            "longitude": geo.get("lng"),
+            "rating": place.get("rating"),
+            "place_id": place.get("place_id"),
+            "source": "google_maps"
+        }
+
     # ---------------------------------------------------------------------
     # PAGE FETCHING
     # ---------------------------------------------------------------------
 
     def fetch_page_content(self, url: str) -> Optional[str]:
-        """Fetch page HTML safely."""
+        """
+        Fetch page HTML safely: at most MAX_PAGE_BYTES, decoded with the
+        page's declared charset (see _decode_page).
+        """
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (compatible; VendorFinderBot/1.0)"
-            }
-            response = requests.get(url, headers=headers, timeout=8)
-            response.raise_for_status()
-            return response.text
+            with self.session.get(url, timeout=PAGE_FETCH_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                buf = bytearray()
+                for chunk in response.iter_content(PAGE_CHUNK_SIZE):
+                    buf += chunk
+                    if len(buf) >= MAX_PAGE_BYTES:
+                        break
+                return _decode_page(bytes(buf[:MAX_PAGE_BYTES]), response.headers.get("content-type"))
+        except Exception:
+            return None
+
+    async def fetch_page_content_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str
+    ) -> Optional[str]:
+        """fetch_page_content over a shared AsyncClient."""
+        try:
+            async with client.stream(
+                "GET",
+                url,
+                headers=self.PAGE_HEADERS,
+                timeout=PAGE_FETCH_TIMEOUT,
+                follow_redirects=True
+            ) as response:
+                response.raise_for_status()
+                buf = bytearray()
+                async for chunk in response.aiter_bytes(PAGE_CHUNK_SIZE):
+                    buf += chunk
+                    if len(buf) >= MAX_PAGE_BYTES:
+                        break
+                return _decode_page(bytes(buf[:MAX_PAGE_BYTES]), response.headers.get("content-type"))
         except Exception:
             return None
 
@@ -171,7 +420,33 @@ class VendorExtractor:
         """
         Extract, enrich, and score a vendor from a search result.
         """
+        rejected = self._screen_result(search_result)
+        if rejected:
+            return rejected
+
+        html = self.fetch_page_content(search_result.get("link", ""))
+        return self._build_vendor(search_result, user_location, html)
+
+    async def extract_vendor_info_async(
+        self,
+        client: httpx.AsyncClient,
+        search_result: Dict,
+        user_location: str
+    ) -> Dict:
+        """
+        extract_vendor_info with the page fetch awaited on the caller's
+        client; parsing and the (throttled, cached) Maps lookup run in a
+        worker thread so the event loop stays free.
+        """
+        rejected = self._screen_result(search_result)
+        if rejected:
+            return rejected
+
+        html = await self.fetch_page_content_async(client, search_result.get("link", ""))
+        return await asyncio.to_thread(self._build_vendor, search_result, user_location, html)
 
+    def _screen_result(self, search_result: Dict) -> Optional[Dict]:
+        """Discard record for results not worth fetching, else None."""
         combined_text = f"{search_result.get('title', '')} {search_result.get('snippet', '')}"
 
         if self.is_job_post(combined_text):
@@ -183,24 +458,55 @@ class VendorExtractor:
 
 
         # ---------------- HARD FILTER ----------------
-        url = search_result.get("link", "")
-        if not self.is_potential_vendor_url(url):
+        if not self.is_potential_vendor_url(search_result.get("link", "")):
             return {
                 "confidence_score": 0.0,
                 "discarded": True
             }
 
+        return None
+
+    def _build_vendor(
+        self,
+        search_result: Dict,
+        user_location: str,
+        html: Optional[str]
+    ) -> Dict:
+        """Vendor profile from a screened result and its fetched page (if any)."""
+        vendor, soft_signals = self._parse_vendor(search_result, user_location, html)
+
+        if self._wants_maps(vendor):
+            maps_data = self.enrich_with_google_maps(
+                vendor["identity"]["name"],
+                vendor["location"]["text"]
+            )
+            self._attach_maps(vendor, maps_data)
+
+        return self._finalize_vendor(vendor, soft_signals)
+
+    def _parse_vendor(
+        self,
+        search_result: Dict,
+        user_location: str,
+        html: Optional[str]
+    ) -> Tuple[Dict, frozenset]:
+        """
+        Vendor skeleton from the snippet and page; returns
+        (vendor, soft-signal words found in snippet or page).
+        """
+        url = search_result.get("link", "")
         vendor = {
             "identity": {
                 "name": search_result.get("title", ""),
                 "source": search_result.get("source", ""),
                 "url": url
             },
+            # Sets while parsing; _finalize_vendor turns them into lists
             "contacts": {
-                "whatsapp": [],
+                "whatsapp": set(),
             },
             "social": {
-                "instagram": [],
+                "instagram": set(),
             },
             "location": {
                 "text": None,
@@ -212,62 +518,87 @@ class VendorExtractor:
         }
 
         snippet = search_result.get("snippet", "")
-        inferred_location = None
+        snippet_lower = snippet.lower()
 
         # ---------------- SNIPPET EXTRACTION ----------------
-        vendor["contacts"]["whatsapp"] += self.extract_whatsapp_numbers(snippet)
-        vendor["social"]["instagram"] += self.extract_instagram_links(snippet)
+        numbers, ig_links = self.extract_contacts(snippet)
+        vendor["contacts"]["whatsapp"].update(numbers)
+        vendor["social"]["instagram"].update(ig_links)
 
-        inferred_location = self.infer_location_from_text(snippet, user_location)
+        inferred_location = self._location_in(snippet_lower) or user_location or None
         vendor["location"]["text"] = inferred_location
 
         # ---------------- PAGE EXTRACTION ----------------
-        html = self.fetch_page_content(url)
-        page_text = ""
+        page_signals = frozenset()
 
         if html:
-            soup = BeautifulSoup(html, "html.parser")
-            page_text = soup.get_text(separator=" ")
+            page_text, title = self._read_page(html)
 
-            vendor["contacts"]["whatsapp"] += self.extract_whatsapp_numbers(page_text)
+            numbers, ig_links, page_signals, page_location = self._analyze_page(page_text)
+            vendor["contacts"]["whatsapp"].update(numbers)
 
             # Filter Instagram to profiles only
-            ig_links = self.extract_instagram_links(page_text)
-            vendor["social"]["instagram"] += [
+            vendor["social"]["instagram"].update(
                 link for link in ig_links if "/p/" not in link
-            ]
+            )
 
-            title = soup.find("title")
-            if title:
-                vendor["identity"]["name"] = title.get_text(strip=True)
+            if title is not None:
+                vendor["identity"]["name"] = title
 
-            inferred_location = self.infer_location_from_text(
-                page_text,
-                inferred_location or user_location
-            )
+            inferred_location = page_location or inferred_location or user_location or None
             vendor["location"]["text"] = inferred_location
 
-        # ---------------- GOOGLE MAPS ENRICHMENT ----------------
-        if vendor["identity"]["name"] and inferred_location:
-            maps_data = self.enrich_with_google_maps(
-                vendor["identity"]["name"],
-                inferred_location
-            )
+        return vendor, frozenset(self._soft_signal_words(snippet_lower)) | page_signals
 
-            # 🔑 Always normalize & resolve address if lat/lng exists
-            if maps_data:
-                maps_data = self.enrich_google_maps_location(maps_data)
+    @staticmethod
+    def _read_page(html: str) -> Tuple[str, Optional[str]]:
+        """
+        Visible text and <title> of a page (title is None when absent),
+        parsed and extracted in C by selectolax's lexbor backend.
+        """
+        tree = LexborHTMLParser(html)
+        tree.strip_tags(NOISE_TAGS)
+        page_text = tree.body.text(separator=" ", strip=True) if tree.body else ""
+        title = tree.css_first("title")
+        return page_text, title.text(strip=True) if title is not None else None
+
+    # ---------------- GOOGLE MAPS ENRICHMENT ----------------
+    @staticmethod
+    def _has_place(vendor: Dict) -> bool:
+        return bool(vendor["identity"]["name"] and vendor["location"]["text"])
+
+    @classmethod
+    def _wants_maps(cls, vendor: Dict) -> bool:
+        """
+        Maps lookups are paid: skip vendors whose preliminary score (contacts
+        plus resolved location) is too low for a Maps hit to matter.
+        """
+        if not cls._has_place(vendor):
+            return False
+        prelim = (
+            0.3
+            + (0.3 if vendor["contacts"]["whatsapp"] else 0.0)
+            + (0.2 if vendor["social"]["instagram"] else 0.0)
+        )
+        return prelim >= Config.MAPS_MIN_PRELIM_SCORE
 
-            vendor["location"]["google_maps"] = maps_data
-            vendor["location"]["resolved"] = inferred_location
+    def _attach_maps(self, vendor: Dict, maps_data: Optional[Dict]):
+        # 🔑 Always normalize & resolve address if lat/lng exists
+        if maps_data:
+            maps_data = self.enrich_google_maps_location(maps_data)
+
+        vendor["location"]["google_maps"] = maps_data
+
+    def _finalize_vendor(self, vendor: Dict, soft_signals: frozenset) -> Dict:
+        if self._has_place(vendor):
+            vendor["location"]["resolved"] = vendor["location"]["text"]
 
         # ---------------- CLEANUP ----------------
-        vendor["contacts"]["whatsapp"] = list(set(vendor["contacts"]["whatsapp"]))
-        vendor["social"]["instagram"] = list(set(vendor["social"]["instagram"]))
+        vendor["contacts"]["whatsapp"] = list(vendor["contacts"]["whatsapp"])
+        vendor["social"]["instagram"] = list(vendor["social"]["instagram"])
 
         # ---------------- SOFT CONTACT SIGNAL ----------------
-        combined_text = f"{snippet} {page_text}".lower()
-        if self.detect_soft_contact_signals(combined_text):
+        if len(soft_signals) >= 2:
             vendor["confidence_score"] += 0.1
             vendor["evidence"].append("soft_contact_signal")
 
@@ -281,19 +612,7 @@ class VendorExtractor:
         """
         Fast heuristic to exclude obvious non-vendor URLs.
         """
-        if not url:
-            return False
-
-        # Exclude Instagram post URLs
-        if "instagram.com/p/" in url:
-            return False
-
-        # Exclude news / blog content
-        bad_keywords = ["news", "press", "job", "vacancy", "salary"]
-        if any(word in url.lower() for word in bad_keywords):
-            return False
-
-        return True
+        return bool(url) and BAD_URL_RE.search(url) is None
 
 
     def detect_soft_contact_signals(self, text: str) -> bool:
@@ -305,42 +624,30 @@ class VendorExtractor:
         if not text:
             return False
 
-        text = text.lower()
-
-        signals = [
-            "order now",
-            "call us",
-            "dm us",
-            "whatsapp",
-            "delivery",
-            "we offer",
-            "our services",
-            "bookings",
-            "price",
-            "pricing",
-            "available",
-            "located in",
-            "based in",
-            "lagos",
-            "abuja",
-        ]
-
-        score = sum(1 for s in signals if s in text)
-
         # Threshold: at least 2 soft signals
-        return score >= 2
+        return len(self._soft_signal_words(text.lower())) >= 2
+
+    @staticmethod
+    def _soft_signal_words(lowered: str) -> set:
+        """Distinct SOFT_SIGNALS present in already-lowercased text."""
+        if SOFT_SIGNAL_AUTOMATON is not None:
+            return {word for _, word in SOFT_SIGNAL_AUTOMATON.iter(lowered)}
+        return {s for s in SOFT_SIGNALS if s in lowered}
 
     def is_job_post(self, text: str) -> bool:
         text = text.lower()
+        if JOB_AUTOMATON is not None:
+            return next(JOB_AUTOMATON.iter(text), None) is not None
         return any(word in text for word in JOB_KEYWORDS)
 
 
     def enrich_google_maps_location(self, location: dict) -> dict:
-        if not location:
-            return location
-
+        """
+        Fill in a missing address by reverse geocoding lat/lng. Places
+        results already carry one, so this is normally a no-op.
+        """
         # If we already have a full address, do nothing
-        if location.get("address"):
+        if not location or location.get("address") or not self.gmaps_client:
             return location
 
         lat = location.get("latitude")
@@ -349,13 +656,21 @@ class VendorExtractor:
         if not lat or not lng:
             return location
 
-        try:
-            results = self.gmaps.reverse_geocode((lat, lng))
-            if results:
-                location["address"] = results[0].get("formatted_address")
-                location["source"] = "google_maps"
-        except Exception:
-            pass
+        key = f"revgeo::{round(lat, 4)},{round(lng, 4)}"
+        address = self._maps_cached(key)
+        if address is _MISSING:
+            try:
+                results = self.gmaps_client.reverse_geocode((lat, lng))
+                address = self._maps_store(
+                    key,
+                    results[0].get("formatted_address") if results else None
+                )
+            except Exception:
+                return location
+
+        if address:
+            location["address"] = address
+            location["source"] = "google_maps"
 
         return location
 
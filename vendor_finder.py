@@ -8,13 +8,32 @@ Responsible for:
 - Producing clean, user-facing output
 """
 
-import json
-from typing import List, Dict
+import asyncio
+import copy
+import functools
+import heapq
+import orjson
+import re
+import threading
+import httpx
+from cachetools import TTLCache
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import AsyncIterator, Callable, Iterator, List, Dict, Optional, Tuple
 from search_engine import SearchEngine
 from vendor_extractor import VendorExtractor
 from config import Config
 from llm_reasoner import LLMReasoner
 
+try:
+    from flashrank import Ranker, RerankRequest
+except ImportError:
+    Ranker = None
+
+
+# Vendor pages fetched in parallel per agent attempt
+EXTRACTION_WORKERS = 8
+
 
 TRADE_SERVICES = [
     "plumber", "electrician", "mechanic", "technician",
@@ -28,23 +47,129 @@ VISUAL_SERVICES = [
 ]
 
 
+TRADE_SERVICE_WORDS = frozenset(TRADE_SERVICES)
+VISUAL_SERVICE_WORDS = frozenset(VISUAL_SERVICES)
+SERVICE_TOKEN_RE = re.compile(r"[a-z]+")
+
+# Keywords that also head compound words ("cupcake", "carpetcleaner");
+# a bare substring test would misfire ("prevention" -> "event")
+COMPOUND_SERVICE_SUFFIXES = (
+    ("cleaner", "trade"),
+    ("repair", "trade"),
+    ("cake", "visual"),
+    ("decor", "visual"),
+)
+
+
+@functools.lru_cache(maxsize=256)
 def classify_service(service: str) -> str:
-    service = service.lower()
-    if any(word in service for word in TRADE_SERVICES):
+    """
+    Match whole words of the service, so plurals ("cakes") count too;
+    otherwise known compound endings ("cupcake", "cheesecake").
+    """
+    tokens = set(SERVICE_TOKEN_RE.findall(service.lower()))
+    tokens.update([t[:-1] for t in tokens if t.endswith("s")])
+
+    if tokens & TRADE_SERVICE_WORDS:
         return "trade"
-    if any(word in service for word in VISUAL_SERVICES):
+    if tokens & VISUAL_SERVICE_WORDS:
         return "visual"
+    for suffix, service_type in COMPOUND_SERVICE_SUFFIXES:
+        if any(token.endswith(suffix) for token in tokens):
+            return service_type
     return "general"
 
 
+def _format_vendor(item) -> str:
+    """One (index, vendor) block of format_output."""
+    idx, vendor = item
+    identity = vendor["identity"]
+    whatsapp = vendor["contacts"]["whatsapp"]
+    instagram = vendor["social"]["instagram"]
+    location = vendor["location"]
+
+    block = (
+        f"\nVendor #{idx}\n"
+        f"{'-' * 40}\n"
+        f"Name: {identity.get('name', 'N/A')}\n"
+        f"Source: {identity.get('source')}\n"
+        f"URL: {identity.get('url')}\n"
+        f"Confidence Score: {vendor['confidence_score']}\n"
+        f"WhatsApp: {', '.join(whatsapp) if whatsapp else 'Not found'}\n"
+        f"Instagram: {', '.join(instagram) if instagram else 'Not found'}"
+    )
+
+    if location.get("resolved"):
+        block += f"\nLocation: {location['resolved']}"
+    gm = location.get("google_maps")
+    if gm:
+        block += f"\nAddress: {gm.get('address')}"
+        if gm.get("rating"):
+            block += f"\nRating: {gm.get('rating')}"
+
+    return block
+
 
 class VendorFinder:
     """Agent-style orchestrator for vendor discovery."""
 
     def __init__(self):
-        self.search_engine = SearchEngine()
+        # One pooled HTTP/2 client for search and LLM calls, so their
+        # keep-alive connections are shared instead of pooled per component.
+        # Sync searches fan out over it too (SearchEngine.search_vendors);
+        # transport retries match the engine's own client. Limits go on the
+        # transport: httpx ignores Client-level ones once a transport is set.
+        self._http = httpx.Client(
+            timeout=15,
+            transport=httpx.HTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+                retries=3
+            )
+        )
+
+        self.search_engine = SearchEngine(http=self._http)
         self.extractor = VendorExtractor()
-        self.reasoner = LLMReasoner()
+        self.reasoner = LLMReasoner(http=self._http)
+        self.batch_reasoning = Config.LLM_BATCH_REASONING
+
+        # Local cross-encoder for vendor intent (CPU, no torch); when present
+        # only borderline candidates go to the LLM for validation. Batched
+        # reasoning validates inside reason_all, so the model isn't loaded.
+        self.ranker = None
+        if Ranker and Config.CROSS_ENCODER_MODEL and not self.batch_reasoning:
+            try:
+                self.ranker = Ranker(model_name=Config.CROSS_ENCODER_MODEL)
+            except Exception as e:
+                print(f"Warning: cross-encoder not initialized: {e}")
+
+        # In-process result cache (L1 in front of the API's Redis cache)
+        self._cache = TTLCache(maxsize=1024, ttl=Config.FINDER_CACHE_TTL)
+        self._cache_lock = threading.Lock()
+
+        # Result files are written off the caller's thread, one at a time
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+
+        # Agent decision handlers by action code; see _agent_loop
+        self._decision_dispatch = {
+            "STOP": self._handle_stop,
+            "EXPAND_LOCATION": self._handle_expand,
+            "TRY_ANOTHER_PLATFORM": self._handle_platform_swap,
+            "RELAX_CONFIDENCE": self._handle_relax
+        }
+
+    def close(self):
+        """Wait for pending result files, then release HTTP resources."""
+        self._io_pool.shutdown(wait=True)
+        self.search_engine.close()
+        self.extractor.close()
+        self._http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     # ------------------------------------------------------------------
     # CORE AGENT FLOW
@@ -64,6 +189,181 @@ class VendorFinder:
         3. Contact enrichment
         4. Platform-aware ranking
         """
+        return self._run_agent(
+            self.search_engine.search_vendors,
+            service,
+            location,
+            platform,
+            max_results,
+            min_confidence
+        )
+
+    async def find_vendors_async(
+        self,
+        service: str,
+        location: str,
+        client: httpx.AsyncClient,
+        platform: str = "instagram",
+        max_results: int = 10,
+        min_confidence: float = 0.3,
+        on_vendor: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """
+        Async variant of find_vendors for use inside an event loop.
+
+        Search fan-out and vendor page fetches run concurrently on the
+        calling loop over the shared client (at most EXTRACTION_WORKERS
+        pages at a time); the agent loop and LLM stages run in a worker
+        thread so the loop stays free for other requests.
+        """
+        loop = asyncio.get_running_loop()
+        page_slots = asyncio.Semaphore(EXTRACTION_WORKERS)
+
+        def search(service: str, location: str, platform: str, top_k: int) -> List[Dict]:
+            return asyncio.run_coroutine_threadsafe(
+                self.search_engine.search_vendors_async(
+                    service, location, platform, client, top_k
+                ),
+                loop
+            ).result()
+
+        async def extract_one(result: Dict, location: str) -> Dict:
+            async with page_slots:
+                return await self.extractor.extract_vendor_info_async(client, result, location)
+
+        def extract(result: Dict, location: str) -> Future:
+            return asyncio.run_coroutine_threadsafe(extract_one(result, location), loop)
+
+        return await asyncio.to_thread(
+            self._run_agent,
+            search,
+            service,
+            location,
+            platform,
+            max_results,
+            min_confidence,
+            on_vendor,
+            extract
+        )
+
+    async def iter_vendors(
+        self,
+        service: str,
+        location: str,
+        client: httpx.AsyncClient,
+        platform: str = "instagram",
+        max_results: int = 10,
+        min_confidence: float = 0.3
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream find_vendors progress as events.
+
+        Yields {"type": "candidate", "vendor": {...}} as each vendor passes
+        extraction (before LLM validation and re-ranking), then one
+        {"type": "result", ...} carrying the final find_vendors result, or
+        {"type": "error", "detail": "..."} if the search failed.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def on_vendor(vendor: Dict):
+            loop.call_soon_threadsafe(
+                events.put_nowait, {"type": "candidate", "vendor": vendor}
+            )
+
+        task = asyncio.ensure_future(self.find_vendors_async(
+            service,
+            location,
+            client,
+            platform=platform,
+            max_results=max_results,
+            min_confidence=min_confidence,
+            on_vendor=on_vendor
+        ))
+        task.add_done_callback(lambda _: events.put_nowait(None))
+
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+
+            try:
+                result = task.result()
+            except Exception as e:
+                # Streamed counterpart of /search's 500: end with an error
+                # line rather than a cut-off body
+                yield {"type": "error", "detail": str(e)}
+                return
+
+            yield {"type": "result", **result}
+        finally:
+            # Consumer gone (client disconnect) or error: don't leave the
+            # search task running unobserved
+            if not task.done():
+                task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def _run_agent(
+        self,
+        search: Callable[[str, str, str, int], List[Dict]],
+        service: str,
+        location: str,
+        platform: str,
+        max_results: int,
+        min_confidence: float,
+        on_vendor: Optional[Callable[[Dict], None]] = None,
+        extract: Optional[Callable[[Dict, str], Future]] = None
+    ) -> Dict:
+        key = (
+            service.strip().lower(),
+            location.strip().lower(),
+            platform,
+            max_results,
+            round(min_confidence, 2)
+        )
+
+        # Deep copies in and out: callers (API responses, stream events) own
+        # what they get, so mutating it can't leak into later hits
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        result = self._agent_loop(
+            search,
+            service,
+            location,
+            platform,
+            max_results,
+            min_confidence,
+            on_vendor,
+            extract
+        )
+
+        # Empty results are often transient (quota / network), so don't pin them
+        if result["vendors"]:
+            snapshot = copy.deepcopy(result)
+            with self._cache_lock:
+                self._cache[key] = snapshot
+
+        return result
+
+    def _agent_loop(
+        self,
+        search: Callable[[str, str, str, int], List[Dict]],
+        service: str,
+        location: str,
+        platform: str,
+        max_results: int,
+        min_confidence: float,
+        on_vendor: Optional[Callable[[Dict], None]] = None,
+        extract: Optional[Callable[[Dict, str], Future]] = None
+    ) -> Dict:
+        """
+        search and extract are the I/O strategies: find_vendors searches
+        synchronously and extracts on a private thread pool; the async
+        variant runs both on its event loop. extract(result, location)
+        returns a Future of the vendor (or discard record).
+        """
         service_type = classify_service(service)
 
         if service_type == "trade":
@@ -84,6 +384,10 @@ class VendorFinder:
         final_reasoning = []
         ranked_vendors: List[Dict] = []
 
+        # Extractions by (url, location), reused when a retry attempt's search
+        # returns pages already fetched (platform switch, relaxed threshold)
+        extracted: Dict[Tuple[str, str], Dict] = {}
+
         while attempt < max_attempts:
             attempt += 1
             print(f"\n🔎 Attempt {attempt}: '{service}' in '{current_location}' on {current_platform}")
@@ -93,97 +397,170 @@ class VendorFinder:
                 current_platform = "instagram"
 
             # ---------------- SEARCH ----------------
-            search_results = self.search_engine.search_vendors(
+            search_results = search(
                 service=service,
                 location=current_location,
-                platform=current_platform
+                platform=current_platform,
+                top_k=max_results * 3
             )
 
             if not search_results:
                 break
 
-            enriched_vendors: List[Dict] = []
-
             # ---------------- EXTRACTION ----------------
-            for result in search_results[: max_results * 3]:
-                vendor = self.extractor.extract_vendor_info(result, current_location)
-
-                # Improvement #1: Hard discard non-vendors
-                if vendor.get("discarded"):
-                    continue
-
-                # Confidence gate
-                if vendor["confidence_score"] < effective_min_confidence:
-                    continue
-
-                # Improvement #2: LLM vendor intent validation
-                if not self.reasoner.is_actual_vendor(service, vendor):
-                    continue
-
-                enriched_vendors.append(vendor)
-
-                if len(enriched_vendors) >= max_results:
-                    break
+            # Pages are fetched in parallel, likeliest vendors first; results
+            # are consumed in that order so the vendors kept don't depend on
+            # fetch timing
+            batch = sorted(
+                islice(search_results, max_results * 3),
+                key=self._pre_score,
+                reverse=True
+            )
+            keys = [(result.get("link", ""), current_location) for result in batch]
+
+            pool = None
+            submit = extract
+            if submit is None:
+                pool = ThreadPoolExecutor(max_workers=EXTRACTION_WORKERS)
+                submit = functools.partial(pool.submit, self.extractor.extract_vendor_info)
+
+            futures: Dict[Tuple[str, str], Future] = {}
+            try:
+                futures.update(
+                    (key, submit(result, current_location))
+                    for key, result in zip(keys, batch)
+                    if key not in extracted
+                )
+
+                def screened() -> Iterator[Dict]:
+                    for key in keys:
+                        if key not in extracted:
+                            extracted[key] = futures[key].result()
+                        vendor = extracted[key]
+
+                        # Improvement #1: Hard discard non-vendors
+                        if vendor.get("discarded"):
+                            continue
+
+                        # Confidence gate
+                        if vendor["confidence_score"] < effective_min_confidence:
+                            continue
+
+                        if on_vendor:
+                            on_vendor(vendor)
+                        yield vendor
+
+                enriched_vendors = list(islice(screened(), max_results))
+            finally:
+                # Quota met: drop fetches not yet started
+                if pool is not None:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                else:
+                    for future in futures.values():
+                        future.cancel()
 
             if not enriched_vendors:
                 break
 
             # ---------------- DETERMINISTIC RANKING ----------------
-            ranked_vendors = self.rank_vendors(enriched_vendors)
+            ranked_vendors = self.rank_vendors(enriched_vendors, top_k=max_results)
 
-            # ---------------- LLM RE-RANK ----------------
-            if len(ranked_vendors) > 1:
-                rerank = self.reasoner.rerank_vendors(service, ranked_vendors)
+            if self.batch_reasoning:
+                # ---------------- LLM REASONING (ONE CALL) ----------------
+                reasoning = self.reasoner.reason_all(
+                    service,
+                    current_location,
+                    current_platform,
+                    ranked_vendors
+                )
 
-                valid_ids = [
-                    i for i in rerank.get("ordered_vendor_ids", [])
-                    if 0 <= i < len(ranked_vendors)
-                ]
+                ranked_vendors = [ranked_vendors[i] for i in reasoning["vendor_ids"]]
 
-                if valid_ids:
-                    ranked_vendors = [ranked_vendors[i] for i in valid_ids]
+                if len(ranked_vendors) > 1 and reasoning.get("reasoning"):
+                    final_reasoning.append(reasoning["reasoning"])
 
-                if rerank.get("reasoning"):
-                    final_reasoning.append(rerank["reasoning"])
+                analysis = reasoning["analysis"]
+                decision = {"action": reasoning["action"]}
 
-            # ---------------- LLM ANALYSIS ----------------
-            analysis = self.reasoner.analyze_results(
-                service,
-                current_location,
-                ranked_vendors
-            )
+            else:
+                # ---------------- VENDOR VALIDATION + RE-RANK ----------------
+                # Improvement #2: vendor intent validation for the whole batch
+                verdict = self._validate_vendors(service, ranked_vendors)
+                ranked_vendors = [ranked_vendors[i] for i in verdict["vendor_ids"]]
+
+                if len(ranked_vendors) > 1 and verdict.get("reasoning"):
+                    final_reasoning.append(verdict["reasoning"])
+
+                # ---------------- GOOD-ENOUGH SHORT-CIRCUIT ----------------
+                # A full page of confident, reachable vendors: nothing for
+                # analysis or a retry to improve, so skip both LLM calls
+                strong = sum(
+                    1 for v in ranked_vendors
+                    if v["confidence_score"] >= Config.STRONG_VENDOR_CONFIDENCE
+                    and v["contacts"]["whatsapp"]
+                )
+                if strong >= max_results:
+                    analysis = {
+                        "explanation": (
+                            f"Found {len(ranked_vendors)} high-confidence {service} vendors "
+                            f"in {current_location} with direct WhatsApp contacts."
+                        ),
+                        "result_quality": "good",
+                        "clarifying_question": "NO_QUESTION"
+                    }
+                    decision = {"action": "STOP"}
 
-            # ---------------- LLM AUTONOMY ----------------
-            decision = self.reasoner.decide_next_search(
-                service,
-                current_location,
-                current_platform,
-                ranked_vendors
-            )
+                else:
+                    # ---------------- LLM ANALYSIS ----------------
+                    analysis = self.reasoner.analyze_results(
+                        service,
+                        current_location,
+                        ranked_vendors
+                    )
+
+                    # ---------------- LLM AUTONOMY ----------------
+                    # Same guardrails as decide_next_search, checked here so the
+                    # common case (decent results / no LLM) skips the call entirely
+                    if len(ranked_vendors) >= 3 or not self.reasoner.client:
+                        decision = {"action": "STOP"}
+                    else:
+                        decision = self.reasoner.decide_next_search(
+                            service,
+                            current_location,
+                            current_platform,
+                            ranked_vendors
+                        )
+
+            # Visual services are pinned to Instagram, so a platform switch
+            # would only repeat this attempt: keep what we have instead
+            if decision.get("action") == "TRY_ANOTHER_PLATFORM" and service_type == "visual":
+                decision = {"action": "STOP"}
 
-            if decision.get("action") == "STOP":
+            # ---------------- APPLY DECISION ----------------
+            handler = self._decision_dispatch.get(decision.get("action"))
+            if handler is None:
+                print(f"⚠️ Unknown agent action {decision.get('action')!r}; stopping")
+                next_state = None
+            else:
+                next_state = handler({
+                    "location": current_location,
+                    "platform": current_platform,
+                    "min_confidence": current_min_confidence,
+                    "effective_min_confidence": effective_min_confidence
+                })
+
+            if next_state is None:
                 return {
                     "vendors": ranked_vendors,
                     "analysis": analysis,
                     "agent_reasoning": final_reasoning
                 }
 
-            # ---------------- APPLY DECISION ----------------
-            if decision["action"] == "EXPAND_LOCATION":
-                current_location = f"{current_location} nearby"
-                final_reasoning.append("Expanded search location.")
-
-            elif decision["action"] == "TRY_ANOTHER_PLATFORM":
-                if service_type == "visual":
-                    current_platform = "instagram"
-                else:
-                    current_platform = "twitter" if current_platform == "instagram" else "instagram"
-
-                final_reasoning.append(f"Switched platform to {current_platform}.")
-
-            elif decision["action"] == "RELAX_CONFIDENCE":
-                current_min_confidence = max(0.1, current_min_confidence - 0.1)
-                final_reasoning.append("Relaxed confidence threshold.")
+            current_location = next_state["location"]
+            current_platform = next_state["platform"]
+            current_min_confidence = next_state["min_confidence"]
+            effective_min_confidence = next_state["effective_min_confidence"]
+            final_reasoning.append(next_state["reasoning"])
 
         # ---------------- FALLBACK ----------------
         return {
@@ -197,29 +574,145 @@ class VendorFinder:
         }
 
 
+    # ------------------------------------------------------------------
+    # DECISION HANDLERS
+    # ------------------------------------------------------------------
+    # Each takes the loop state (location, platform, min_confidence,
+    # effective_min_confidence) and returns the state for the next attempt
+    # with a "reasoning" note, or None to stop.
+    @staticmethod
+    def _handle_stop(state: Dict) -> Optional[Dict]:
+        return None
+
+    @staticmethod
+    def _handle_expand(state: Dict) -> Optional[Dict]:
+        return {
+            **state,
+            "location": f"{state['location']} nearby",
+            "reasoning": "Expanded search location."
+        }
+
+    @staticmethod
+    def _handle_platform_swap(state: Dict) -> Optional[Dict]:
+        platform = "twitter" if state["platform"] == "instagram" else "instagram"
+        return {
+            **state,
+            "platform": platform,
+            "reasoning": f"Switched platform to {platform}."
+        }
+
+    @staticmethod
+    def _handle_relax(state: Dict) -> Optional[Dict]:
+        return {
+            **state,
+            "min_confidence": max(0.1, state["min_confidence"] - 0.1),
+            "effective_min_confidence": max(0.1, state["effective_min_confidence"] - 0.1),
+            "reasoning": "Relaxed confidence threshold."
+        }
+
+    def _validate_vendors(self, service: str, vendors: List[Dict]) -> Dict:
+        """
+        Vendor intent validation; same result shape as
+        LLMReasoner.validate_and_rank_batch.
+
+        With the cross-encoder, clear non-vendors are dropped and clear
+        vendors kept locally; only the borderline band is sent to the LLM.
+        Survivors are ordered by cross-encoder score (stable), or by the
+        LLM when Config.LLM_RERANK is set.
+        """
+        if self.ranker is None or not vendors:
+            return self.reasoner.validate_and_rank_batch(service, vendors)
+
+        scores = self._intent_scores(service, vendors)
+        rejected = {i for i, score in enumerate(scores) if score < Config.VENDOR_INTENT_LOW}
+        borderline = [
+            i for i, score in enumerate(scores)
+            if Config.VENDOR_INTENT_LOW <= score < Config.VENDOR_INTENT_HIGH
+        ]
+
+        if borderline:
+            verdict = self.reasoner.validate_and_rank_batch(
+                service, [vendors[i] for i in borderline]
+            )
+            kept = {borderline[j] for j in verdict["vendor_ids"]}
+            rejected.update(i for i in borderline if i not in kept)
+
+        vendor_ids = [i for i in range(len(vendors)) if i not in rejected]
+
+        if Config.LLM_RERANK and len(vendor_ids) > 1:
+            rerank = self.reasoner.rerank_vendors(service, [vendors[i] for i in vendor_ids])
+            ordered = [
+                vendor_ids[j] for j in dict.fromkeys(rerank.get("ordered_vendor_ids", []))
+                if isinstance(j, int) and 0 <= j < len(vendor_ids)
+            ]
+            return {
+                "vendor_ids": ordered + [i for i in vendor_ids if i not in ordered],
+                "reasoning": rerank.get("reasoning")
+            }
+
+        vendor_ids.sort(key=lambda i: scores[i], reverse=True)
+        return {
+            "vendor_ids": vendor_ids,
+            "reasoning": "Ranked by local cross-encoder."
+        }
+
+    def _intent_scores(self, service: str, vendors: List[Dict]) -> List[float]:
+        """Cross-encoder relevance of each vendor to "<service> vendor", in [0, 1]."""
+        passages = [
+            {
+                "id": i,
+                "text": " ".join(filter(None, (
+                    v["identity"].get("name"),
+                    v["identity"].get("url"),
+                    v["location"].get("text"),
+                )))
+            }
+            for i, v in enumerate(vendors)
+        ]
+        ranked = self.ranker.rerank(RerankRequest(query=f"{service} vendor", passages=passages))
+
+        scores = [0.0] * len(vendors)
+        for passage in ranked:
+            scores[passage["id"]] = float(passage["score"])
+        return scores
+
     # ------------------------------------------------------------------
     # RANKING LOGIC
     # ------------------------------------------------------------------
 
-    def rank_vendors(self, vendors: List[Dict]) -> List[Dict]:
+    def _pre_score(self, result: Dict) -> float:
+        """
+        Cheap pre-fetch estimate of a search result's vendor confidence:
+        search relevance plus contacts already visible in the snippet.
+        """
+        numbers, links = self.extractor.extract_contacts(result.get("snippet", ""))
+        return (
+            result.get("relevance_score", 0.0)
+            + (0.3 if numbers else 0.0)
+            + (0.2 if links else 0.0)
+        )
+
+    def rank_vendors(self, vendors: List[Dict], top_k: Optional[int] = None) -> List[Dict]:
         """
         Rank vendors based on confidence, contact richness, and location strength.
+        Only the best top_k are returned (all when None).
         """
 
-        def ranking_key(vendor: Dict):
-            contact_score = 1 if vendor["contacts"]["whatsapp"] else 0
-            social_score = 1 if vendor["social"]["instagram"] else 0
-            location_score = 1 if vendor["location"].get("google_maps") else 0
-
-            return (
-                vendor["confidence_score"],
-                contact_score,
-                social_score,
-                location_score,
+        # (confidence, contact, social, location, -index): keys are built in
+        # one pass, so selection compares flat tuples only; -index keeps ties
+        # in input order, like a stable descending sort
+        keyed = [
+            (
+                v["confidence_score"],
+                1 if v["contacts"]["whatsapp"] else 0,
+                1 if v["social"]["instagram"] else 0,
+                1 if v["location"].get("google_maps") else 0,
+                -i,
             )
+            for i, v in enumerate(vendors)
+        ]
 
-        vendors.sort(key=ranking_key, reverse=True)
-        return vendors
+        return [vendors[-key[-1]] for key in heapq.nlargest(top_k or len(keyed), keyed)]
 
     # ------------------------------------------------------------------
     # OUTPUT FORMATTING (USER-FACING)
@@ -231,54 +724,25 @@ class VendorFinder:
         if not vendors:
             return "\nNo qualified vendors found.\n"
 
-        lines = []
-        lines.append("=" * 90)
-        lines.append(f"✅ FOUND {len(vendors)} QUALIFIED VENDORS")
-        lines.append("=" * 90)
-
-        for idx, vendor in enumerate(vendors, 1):
-            identity = vendor["identity"]
-            contacts = vendor["contacts"]
-            social = vendor["social"]
-            location = vendor["location"]
-
-            lines.append(f"\nVendor #{idx}")
-            lines.append("-" * 40)
-            lines.append(f"Name: {identity.get('name', 'N/A')}")
-            lines.append(f"Source: {identity.get('source')}")
-            lines.append(f"URL: {identity.get('url')}")
-            lines.append(f"Confidence Score: {vendor['confidence_score']}")
-
-            if contacts["whatsapp"]:
-                lines.append(f"WhatsApp: {', '.join(contacts['whatsapp'])}")
-            else:
-                lines.append("WhatsApp: Not found")
-
-            if social["instagram"]:
-                lines.append(f"Instagram: {', '.join(social['instagram'])}")
-            else:
-                lines.append("Instagram: Not found")
-
-            if location.get("resolved"):
-                lines.append(f"Location: {location['resolved']}")
-            if location.get("google_maps"):
-                gm = location["google_maps"]
-                lines.append(f"Address: {gm.get('address')}")
-                if gm.get("rating"):
-                    lines.append(f"Rating: {gm.get('rating')}")
-
-        lines.append("\n")
-        return "\n".join(lines)
+        rule = "=" * 90
+        header = f"{rule}\n✅ FOUND {len(vendors)} QUALIFIED VENDORS\n{rule}"
+        return "\n".join([header, *map(_format_vendor, enumerate(vendors, 1)), "\n"])
 
     # ------------------------------------------------------------------
     # DATA EXPORT
     # ------------------------------------------------------------------
 
-    def save_to_json(self, vendors: List[Dict], filename: str):
-        """Persist vendor results to JSON."""
+    def save_to_json(self, vendors: List[Dict], filename: str) -> Future:
+        """
+        Persist vendor results to JSON in the background; returns the
+        write's Future (close() waits for all of them).
+        """
+        return self._io_pool.submit(self._write_json, vendors, filename)
 
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(vendors, f, indent=2, ensure_ascii=False)
+    @staticmethod
+    def _write_json(vendors: List[Dict], filename: str):
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(vendors, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
         print(f"💾 Results saved to {filename}")
 
@@ -297,35 +761,33 @@ def main():
             print(f"   - {key}")
         print("The app will run with limited functionality.\n")
 
-    finder = VendorFinder()
-
-    print("\n🤖 Local Vendor Finder AI Assistant")
-    print("=" * 90)
-
-    result1 = finder.find_vendors(
-        service="cake",
-        location="Lagos",
-        platform="instagram",
-        max_results=5
-    )
-
-    vendors1 = result1["vendors"]
-
-    print(finder.format_output(vendors1))
-    finder.save_to_json(vendors1, "cake_lagos_vendors.json")
-
-
-    result2 = finder.find_vendors(
-        service="plumber",
-        location="Abuja",
-        platform="twitter",
-        max_results=5
-    )
-
-    vendors2 = result2["vendors"]
-
-    print(finder.format_output(vendors2))
-    finder.save_to_json(vendors2, "plumber_abuja_vendors.json")
+    with VendorFinder() as finder:
+        print("\n🤖 Local Vendor Finder AI Assistant")
+        print("=" * 90)
+
+        demos = [
+            (dict(service="cake", location="Lagos", platform="instagram"), "cake_lagos_vendors.json"),
+            (dict(service="plumber", location="Abuja", platform="twitter"), "plumber_abuja_vendors.json"),
+        ]
+
+        # Independent and I/O-bound, so run them side by side on the one
+        # (thread-safe) finder; results are printed in demo order
+        with ThreadPoolExecutor(max_workers=len(demos)) as pool:
+            futures = [
+                pool.submit(finder.find_vendors, max_results=5, **query)
+                for query, _ in demos
+            ]
+
+            writes = []
+            for future, (_, filename) in zip(futures, demos):
+                vendors = future.result()["vendors"]
+
+                print(finder.format_output(vendors))
+                writes.append(finder.save_to_json(vendors, filename))
+
+        # Surface failed writes (permissions, full disk) instead of losing them
+        for write in writes:
+            write.result()
 
 
 